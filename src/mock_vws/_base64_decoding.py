@@ -4,9 +4,17 @@ Helpers for handling Base64 like Vuforia does.
 
 import base64
 import binascii
-import string
+import functools
+import re
 
+# Like Vuforia, this checks only which characters are used, not the full
+# base64 grammar.
+_ACCEPTABLE_CHARACTERS_PATTERN = re.compile('[A-Za-z0-9+/=]*')
 
+
+# The same image and metadata are decoded by several validators and then by
+# the endpoint handling a request, so a few recent results are kept.
+@functools.lru_cache(maxsize=4)
 def decode_base64(encoded_data: str) -> bytes:
     """
     Decode base64 somewhat like Vuforia does.
@@ -18,10 +26,8 @@ def decode_base64(encoded_data: str) -> bytes:
     Returns:
         The given data, decoded as base64.
     """
-    acceptable_characters = string.ascii_letters + string.digits + '+/='
-    for character in encoded_data:
-        if character not in acceptable_characters:
-            raise binascii.Error()
+    if not _ACCEPTABLE_CHARACTERS_PATTERN.fullmatch(encoded_data):
+        raise binascii.Error()
 
     if len(encoded_data) % 4 == 0:
         decoded = base64.b64decode(encoded_data)
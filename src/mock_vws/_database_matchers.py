@@ -3,6 +3,7 @@ Helpers for getting databases which match keys given in requests.
 """
 
 import base64
+import functools
 import hashlib
 import hmac
 from typing import Dict, Iterable, Optional
@@ -10,21 +11,47 @@ from typing import Dict, Iterable, Optional
 from mock_vws.database import VuforiaDatabase
 
 
+@functools.lru_cache(maxsize=32)
+def _hmac_sha1(key: bytes) -> hmac.HMAC:
+    """
+    Return an HMAC-SHA1 object for the given `key`, with no data given.
+
+    Keying an HMAC object hashes the key padding, and the same keys are used
+    for every request, so keyed objects are kept and copied.
+    The returned object is shared and must not be updated.
+    """
+    return hmac.new(key=key, msg=None, digestmod=hashlib.sha1)
+
+
 def _compute_hmac_base64(key: bytes, data: bytes) -> bytes:
     """
     Return the Base64 encoded HMAC-SHA1 hash of the given `data` using the
     provided `key`.
     """
-    hashed = hmac.new(key=key, msg=None, digestmod=hashlib.sha1)
+    hashed = _hmac_sha1(key=key).copy()
     hashed.update(msg=data)
     return base64.b64encode(s=hashed.digest())
 
 
+@functools.lru_cache(maxsize=1)
+def _content_md5_hex(content: bytes) -> str:
+    """
+    Return the hex MD5 digest of a request body.
+
+    The same body is signed for each database, by multiple validators, for
+    each request, so the digest of the most recent body is cached.
+    """
+    return hashlib.md5(content).hexdigest()
+
+
+# The same header is expected by several validators and by the endpoint for
+# each request, so recent results are kept.
+@functools.lru_cache(maxsize=16)
 def _authorization_header(  # pylint: disable=too-many-arguments
     access_key: str,
     secret_key: str,
     method: str,
-    content: bytes,
+    content_md5_hex: str,
     content_type: str,
     date: str,
     request_path: str,
@@ -37,7 +64,8 @@ def _authorization_header(  # pylint: disable=too-many-arguments
         access_key: A VWS server or client access key.
         secret_key: A VWS server or client secret key.
         method: The HTTP method which will be used in the request.
-        content: The request body which will be used in the request.
+        content_md5_hex: The hex MD5 digest of the request body which will be
+            used in the request.
         content_type: The `Content-Type` header which will be used in the
             request.
         date: The current date which must exactly match the date sent in the
@@ -49,10 +77,6 @@ def _authorization_header(  # pylint: disable=too-many-arguments
         An `Authorization` header which can be used for a request made to the
             VWS API with the given attributes.
     """
-    hashed = hashlib.md5()
-    hashed.update(content)
-    content_md5_hex = hashed.hexdigest()
-
     components_to_sign = [
         method,
         content_md5_hex,
@@ -90,23 +114,30 @@ def get_database_matching_client_keys(
     Returns:
         The database which is being accessed by the given client request.
     """
-    content_type = request_headers.get('Content-Type', '').split(';')[0]
-    auth_header = request_headers.get('Authorization')
-    content = request_body or b''
+    content_type = request_headers.get('Content-Type', '').partition(';')[0]
+    auth_header = request_headers.get('Authorization', '')
     date = request_headers.get('Date', '')
 
     for database in databases:
+        # Only a header which names the access key of a database can match
+        # it, so the signature is not computed for other databases.
+        if not auth_header.startswith(f'VWS {database.client_access_key}:'):
+            continue
+
         expected_authorization_header = _authorization_header(
             access_key=database.client_access_key,
             secret_key=database.client_secret_key,
             method=request_method,
-            content=content,
+            content_md5_hex=_content_md5_hex(content=request_body or b''),
             content_type=content_type,
             date=date,
             request_path=request_path,
         )
 
-        if auth_header == expected_authorization_header:
+        if hmac.compare_digest(
+            auth_header.encode(),
+            expected_authorization_header.encode(),
+        ):
             return database
     return None
 
@@ -132,22 +163,29 @@ def get_database_matching_server_keys(
     Returns:
         The database being accessed by the given server request.
     """
-    content_type = request_headers.get('Content-Type', '').split(';')[0]
-    auth_header = request_headers.get('Authorization')
-    content = request_body or b''
+    content_type = request_headers.get('Content-Type', '').partition(';')[0]
+    auth_header = request_headers.get('Authorization', '')
     date = request_headers.get('Date', '')
 
     for database in databases:
+        # Only a header which names the access key of a database can match
+        # it, so the signature is not computed for other databases.
+        if not auth_header.startswith(f'VWS {database.server_access_key}:'):
+            continue
+
         expected_authorization_header = _authorization_header(
             access_key=database.server_access_key,
             secret_key=database.server_secret_key,
             method=request_method,
-            content=content,
+            content_md5_hex=_content_md5_hex(content=request_body or b''),
             content_type=content_type,
             date=date,
             request_path=request_path,
         )
 
-        if auth_header == expected_authorization_header:
+        if hmac.compare_digest(
+            auth_header.encode(),
+            expected_authorization_header.encode(),
+        ):
             return database
     return None
@@ -3,15 +3,48 @@ Common utilities for creating mock routes.
 """
 
 import email.utils
+import functools
 import json
+import re
+import secrets
+import time
 from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Any, Callable, Dict, FrozenSet, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
-import wrapt
 from requests_mock.request import _RequestObjectProxy
 from requests_mock.response import _Context
 
+from mock_vws._constants import ResultCodes
+
+# Many responses give only a transaction ID and a result code.
+# Their bodies are filled in from a template for each result code rather than
+# built as dictionaries and serialized.
+# These give the same output as ``json_dump``.
+_TRANSACTION_RESULT_TEMPLATES: Dict[ResultCodes, str] = {
+    result_code: (
+        '{{"transaction_id":"{transaction_id}",'
+        f'"result_code":"{result_code.value}"}}}}'
+    )
+    for result_code in ResultCodes
+}
+
+
+def transaction_result_body(result_code: ResultCodes) -> str:
+    """
+    Get the body of a response which gives only a new transaction ID and a
+    result code.
+
+    Args:
+        result_code: The result code to give.
+
+    Returns:
+        The JSON response body.
+    """
+    return _TRANSACTION_RESULT_TEMPLATES[result_code].format(
+        transaction_id=secrets.token_hex(16),
+    )
+
 
 @dataclass(frozen=True)
 class Route:
@@ -30,66 +63,427 @@ class Route:
     http_methods: FrozenSet[str]
 
 
-def json_dump(body: Dict[str, Any]) -> str:
+@functools.lru_cache(maxsize=64)
+def parse_content_type(
+    content_type_header: str,
+) -> Tuple[str, Optional[bytes]]:
     """
+    Parse a ``Content-Type`` header.
+
+    The same header is parsed by many validators for each query request, so
+    results are cached.
+
+    Args:
+        content_type_header: The ``Content-Type`` header sent with a request.
+
     Returns:
-        JSON dump of data in the same way that Vuforia dumps data.
+        The main value of the header and the multipart boundary, as bytes, if
+        one is given.
     """
-    return json.dumps(obj=body, separators=(',', ':'))
+    # This is faster than ``cgi.parse_header``, which is deprecated.
+    # Unlike ``cgi.parse_header``, this does not handle semicolons in quoted
+    # parameter values, but a multipart boundary cannot contain a semicolon.
+    main_value, *parameters = content_type_header.split(';')
+    boundary = None
+    for parameter in parameters:
+        name, separator, value = parameter.partition('=')
+        if not separator or name.strip().lower() != 'boundary':
+            continue
 
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        boundary = value.encode()
 
-@wrapt.decorator
-def set_content_length_header(
-    wrapped: Callable[..., str],
-    instance: Any,  # pylint: disable=unused-argument
-    args: Tuple[_RequestObjectProxy, _Context],
-    kwargs: Dict,
-) -> str:
+    return main_value.strip(), boundary
+
+
+@functools.lru_cache(maxsize=64)
+def parse_authorization_header(authorization_header: str) -> Tuple[str, str]:
     """
-    Set the `Content-Length` header.
+    Parse an ``Authorization`` header of the form ``VWS <access key>:<sig>``.
+
+    The same header is read by several validators for each request, so
+    results are cached.
 
     Args:
-        wrapped: An endpoint function for `requests_mock`.
-        instance: The class that the endpoint function is in.
-        args: The arguments given to the endpoint function.
-        kwargs: The keyword arguments given to the endpoint function.
+        authorization_header: The ``Authorization`` header sent with a
+            request.
+
+    Returns:
+        The access key and the signature given in the header.
+
+    Raises:
+        ValueError: The header does not have exactly one colon, or the part
+            before the colon does not have exactly one space.
+    """
+    first_part, signature = authorization_header.split(':')
+    _, access_key = first_part.split(' ')
+    return access_key, signature
+
+
+# A header field, or the continuation of one.
+_HEADER_LINE_PATTERN = re.compile(rb'[\x21-\x39\x3b-\x7e]*:|[\t ]')
+
+
+def _parse_header_parameters(header_value: bytes) -> Dict[bytes, bytes]:
+    """
+    Get the parameters of a header value, as ``cgi.parse_header`` does.
+
+    Args:
+        header_value: A header value with parameters separated by ``;``.
+
+    Returns:
+        A mapping of lower case parameter names to parameter values.
+    """
+    header_parts = []
+    remaining = b';' + header_value
+    while remaining.startswith(b';'):
+        remaining = remaining[1:]
+        # Semicolons in quotes do not separate parameters.
+        end = remaining.find(b';')
+        while (
+            end > 0
+            and (
+                remaining.count(b'"', 0, end) - remaining.count(b'\\"', 0, end)
+            )
+            % 2
+        ):
+            end = remaining.find(b';', end + 1)
+        if end < 0:
+            end = len(remaining)
+        header_parts.append(remaining[:end].strip())
+        remaining = remaining[end:]
+
+    parameters = {}
+    # The first part is the value itself, not a parameter.
+    for parameter in header_parts[1:]:
+        parameter_name, equals, parameter_value = parameter.partition(b'=')
+        if not equals:
+            continue
+
+        parameter_value = parameter_value.strip()
+        if (
+            len(parameter_value) >= 2
+            and parameter_value[:1] == parameter_value[-1:] == b'"'
+        ):
+            parameter_value = (
+                parameter_value[1:-1]
+                .replace(b'\\\\', b'\\')
+                .replace(b'\\"', b'"')
+            )
+        parameters[parameter_name.strip().lower()] = parameter_value
+
+    return parameters
+
+
+def _parse_part_headers(part_headers: bytes) -> Tuple[Optional[str], bool]:
+    """
+    Get the field name of a ``multipart/form-data`` part, and whether the part
+    is a file.
+
+    Args:
+        part_headers: The headers of the part.
+
+    Returns:
+        The name given in the ``Content-Disposition`` header of the part, if
+        any, and whether a file name is given.
+    """
+    header_lines = part_headers.splitlines(keepends=True)
+    for line_number, header_line in enumerate(header_lines, start=1):
+        # As with ``cgi.parse_multipart``, headers end at the first line which
+        # is not a header.
+        if not _HEADER_LINE_PATTERN.match(header_line):
+            break
+
+        # Continuation lines are not headers themselves.
+        if header_line.startswith((b' ', b'\t')):
+            continue
+
+        header_name, _, header_value = header_line.partition(b':')
+        if header_name.strip().lower() != b'content-disposition':
+            continue
+
+        # A header value continues on following lines which start with
+        # whitespace.
+        for continuation_line in header_lines[line_number:]:
+            if not continuation_line.startswith((b' ', b'\t')):
+                break
+            header_value += continuation_line
+
+        parameters = _parse_header_parameters(
+            header_value=header_value.rstrip(b'\r\n'),
+        )
+        name = parameters.get(b'name')
+        is_file = b'filename' in parameters
+        if name is None:
+            return None, is_file
+        return name.decode('utf-8', 'replace'), is_file
+
+    return None, False
+
+
+def _strip_line_ending(data: bytes) -> bytes:
+    """
+    Remove one line ending from the end of some data, if there is one.
+    """
+    if data.endswith(b'\r\n'):
+        return data[:-2]
+    if data.endswith((b'\n', b'\r')):
+        return data[:-1]
+    return data
+
+
+# Whitespace which ``bytes.strip`` removes, other than a newline.
+_LINE_WHITESPACE = rb'[ \t\x0b\x0c\r]*'
+
+# As with ``cgi.parse_multipart``, the headers of a part end at the first line
+# which is empty or only whitespace, or at the end of the body.
+_PART_HEADERS_END_PATTERN = re.compile(
+    rb'^' + _LINE_WHITESPACE + rb'(?:\n|\Z)|\Z',
+    re.MULTILINE,
+)
+
+# What may follow a delimiter at the start of a line for it to be recognized.
+# A close delimiter is followed by ``--``.
+_DELIMITER_LINE_END_PATTERN = re.compile(
+    rb'(--)?' + _LINE_WHITESPACE + rb'(?:\n|\Z)',
+)
+
+
+def _find_delimiter_line(
+    request_body: bytes,
+    delimiter: bytes,
+    start: int,
+) -> Optional[Tuple[int, int, bool]]:
+    """
+    Find the next delimiter line in a ``multipart/form-data`` request body.
+
+    As with ``cgi.parse_multipart``, a delimiter is only recognized at the
+    start of a line, and only if it is followed by the end of the line,
+    optionally after ``--`` and whitespace.
+
+    Args:
+        request_body: The body of the request.
+        delimiter: ``--`` followed by the boundary.
+        start: The index of the first character of the line to start
+            searching from.
 
     Returns:
-        The result of calling the endpoint.
+        The index of the start of the delimiter line, the index after its end,
+        and whether it is a close delimiter, or ``None`` if there are no more
+        delimiter lines.
+    """
+    if start == 0 and request_body.startswith(delimiter):
+        line_start = 0
+    else:
+        line_start = request_body.find(b'\n' + delimiter, max(start - 1, 0))
+        if line_start == -1:
+            return None
+        line_start += len(b'\n')
+
+    while True:
+        line_end = _DELIMITER_LINE_END_PATTERN.match(
+            request_body,
+            line_start + len(delimiter),
+        )
+        if line_end is not None:
+            return line_start, line_end.end(), line_end.group(1) is not None
+
+        line_start = request_body.find(b'\n' + delimiter, line_start)
+        if line_start == -1:
+            return None
+        line_start += len(b'\n')
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_multipart_body(
+    request_body: bytes,
+    boundary: bytes,
+) -> Dict[Optional[str], List[Any]]:
+    r"""
+    Parse a ``multipart/form-data`` request body with the given boundary.
+
+    Each query request body is parsed by many validators and then by the query
+    endpoint.
+    One cache entry is enough to share a single parse between those, without
+    keeping the bodies of earlier requests alive.
+
+    As with ``cgi.parse_multipart``, file contents are given as bytes and other
+    values are given as strings.
+    Lines may end with either ``\r\n`` or ``\n``, the closing delimiter may
+    be missing, and parts with no field name are given under ``None``.
+    A delimiter is only recognized on a line of its own, so text which only
+    starts with the delimiter is part of the preamble or of a part's content.
+    """
+    # Searching for each delimiter is much faster for large images than
+    # ``cgi.parse_multipart``, which reads the body line by line.
+    delimiter = b'--' + boundary
+    parsed: Dict[Optional[str], List[Any]] = {}
+
+    # Anything before the first line which is only the delimiter is ignored.
+    first_delimiter = re.search(
+        rb'(?:^|\n)'
+        + _LINE_WHITESPACE
+        + re.escape(delimiter)
+        + _LINE_WHITESPACE
+        + rb'(?:\n|\Z)',
+        request_body,
+    )
+    if first_delimiter is None:
+        return parsed
+
+    part_start = first_delimiter.end()
+    while part_start < len(request_body):
+        headers_end = _PART_HEADERS_END_PATTERN.search(
+            request_body,
+            part_start,
+        )
+        # The pattern matches at the end of the body, if nowhere else.
+        assert headers_end is not None
+        headers_end_start, content_start = headers_end.span()
+        part_headers = request_body[part_start:headers_end_start]
+
+        delimiter_line = _find_delimiter_line(
+            request_body=request_body,
+            delimiter=delimiter,
+            start=content_start,
+        )
+        if delimiter_line is None:
+            content_end = len(request_body)
+        else:
+            content_end, _, _ = delimiter_line
+
+        # The line ending before the next delimiter, or at the end of a body
+        # with no closing delimiter, is not part of the content.
+        part_content = _strip_line_ending(
+            request_body[content_start:content_end],
+        )
+
+        name, is_file = _parse_part_headers(part_headers=part_headers)
+        value = (
+            part_content
+            if is_file
+            else part_content.decode('utf-8', 'replace')
+        )
+        parsed.setdefault(name, []).append(value)
+
+        if delimiter_line is None:
+            return parsed
+
+        _, part_start, is_close_delimiter = delimiter_line
+        if is_close_delimiter:
+            return parsed
+
+    return parsed
+
+
+def parse_multipart(
+    request_headers: Dict[str, str],
+    request_body: bytes,
+) -> Dict[Optional[str], List[Any]]:
     """
-    _, context = args
+    Parse a ``multipart/form-data`` request body.
 
-    result = wrapped(*args, **kwargs)
-    context.headers['Content-Length'] = str(len(result))
-    return result
+    Args:
+        request_headers: The headers sent with the request.
+        request_body: The body of the request.
 
+    Returns:
+        A mapping of field names to the values given for those fields.
+        Values of parts with no field name are given under ``None``.
+        This is shared between callers and must not be modified.
+    """
+    _, boundary = parse_content_type(request_headers['Content-Type'])
+    assert isinstance(boundary, bytes)
+    return _parse_multipart_body(request_body=request_body, boundary=boundary)
 
-@wrapt.decorator
-def set_date_header(
-    wrapped: Callable[..., str],
-    instance: Any,  # pylint: disable=unused-argument
-    args: Tuple[_RequestObjectProxy, _Context],
-    kwargs: Dict,
-) -> str:
+
+@functools.lru_cache(maxsize=1)
+def parse_json(request_body: bytes) -> Any:
     """
-    Set the `Date` header.
+    Parse a JSON request body.
+
+    Each services request body is parsed by many validators, so the result for
+    the most recent body is cached.
+
+    Args:
+        request_body: The body of the request.
+
+    Returns:
+        The parsed body.
+        This is shared between callers and must not be modified.
+    """
+    return json.loads(request_body.decode())
+
+
+# ``json.dumps`` creates a new encoder on every call when given separators.
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+def json_dump(body: Any) -> str:
+    """
+    Returns:
+        JSON dump of data in the same way that Vuforia dumps data.
+    """
+    return _JSON_ENCODER.encode(body)
+
+
+@functools.lru_cache(maxsize=1)
+def _format_date_header(timestamp: int) -> str:
+    """
+    Format a ``Date`` header.
+
+    The header has a resolution of one second, so it is formatted at most once
+    per second.
+
+    Args:
+        timestamp: Seconds since the epoch.
+
+    Returns:
+        The given time, formatted for a ``Date`` header.
+    """
+    return email.utils.formatdate(timestamp, localtime=False, usegmt=True)
+
+
+def set_response_headers(wrapped: Callable[..., str]) -> Callable[..., str]:
+    """
+    Set the `Date` and `Content-Length` headers.
 
     Args:
         wrapped: An endpoint function for `requests_mock`.
-        instance: The class that the endpoint function is in.
-        args: The arguments given to the endpoint function.
-        kwargs: The keyword arguments given to the endpoint function.
 
     Returns:
-        The result of calling the endpoint.
-    """
-    _, context = args
-    date = email.utils.formatdate(None, localtime=False, usegmt=True)
-
-    result = wrapped(*args, **kwargs)
-    if (
-        context.headers['Connection'] != 'Close'
-        and context.status_code != HTTPStatus.GATEWAY_TIMEOUT
-    ):
-        context.headers['Date'] = date
-    return result
+        The endpoint function, wrapped so that it sets the headers.
+    """
+
+    @functools.wraps(wrapped)
+    def wrapper(
+        instance: Any,
+        request: _RequestObjectProxy,
+        context: _Context,
+    ) -> str:
+        """
+        Call the endpoint and set the headers of its response.
+
+        Args:
+            instance: The class that the endpoint function is in.
+            request: The request to the endpoint.
+            context: The context of the response.
+
+        Returns:
+            The result of calling the endpoint.
+        """
+        date = _format_date_header(timestamp=int(time.time()))
+
+        result = wrapped(instance, request, context)
+        if (
+            context.headers['Connection'] != 'Close'
+            and context.status_code != HTTPStatus.GATEWAY_TIMEOUT
+        ):
+            context.headers['Date'] = date
+
+        context.headers['Content-Length'] = str(len(result))
+        return result
+
+    return wrapper
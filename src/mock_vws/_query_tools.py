@@ -2,20 +2,16 @@
 Tools for making Vuforia queries.
 """
 
-import base64
-import cgi
 import datetime
-import io
-import uuid
+import hashlib
+import secrets
 from typing import Any, Dict, List, Set, Union
 
-from backports.zoneinfo import ZoneInfo
-
-from mock_vws._base64_decoding import decode_base64
 from mock_vws._constants import ResultCodes, TargetStatuses
 from mock_vws._database_matchers import get_database_matching_client_keys
-from mock_vws._mock_common import json_dump
+from mock_vws._mock_common import json_dump, parse_multipart
 from mock_vws.database import VuforiaDatabase
+from mock_vws.target import Target
 
 
 class MatchingTargetsWithProcessingStatus(Exception):
@@ -30,17 +26,64 @@ class ActiveMatchingTargetsDeleteProcessing(Exception):
     """
 
 
-def _images_match(image: io.BytesIO, another_image: io.BytesIO) -> bool:
+def _get_recognized_matches(
+    matching_targets: List[Target],
+    now: datetime.datetime,
+    recognition_timedelta: datetime.timedelta,
+    processing_timedelta: datetime.timedelta,
+) -> List[Target]:
     """
-    Given two images, return whether they are matching.
+    Args:
+        matching_targets: The targets with images which match the query image.
+        now: The time of the query.
+        recognition_timedelta: The length of time after a target has been
+            deleted that the query endpoint will still recognize the target
+            for.
+        processing_timedelta: The length of time after a target deletion is
+            recognized that the query endpoint will return a 500 response on a
+            match.
 
-    In the real Vuforia, this matching is fuzzy.
-    For now, we check exact byte matching.
+    Returns:
+        The matching targets which the query endpoint recognizes, with
+        targets which are not deleted first.
 
-    See https://github.com/VWS-Python/vws-python-mock/issues/3 for changing
-    that.
+    Raises:
+        MatchingTargetsWithProcessingStatus: There is at least one matching
+            target which has the status 'processing'.
+        ActiveMatchingTargetsDeleteProcessing: There is at least one active
+            target which matches and was recently deleted.
     """
-    return bool(image.getvalue() == another_image.getvalue())
+    deletion_processing_timedelta = (
+        recognition_timedelta + processing_timedelta
+    )
+    not_deleted_matches = []
+    deletion_not_recognized_matches = []
+    active_matching_targets_delete_processing = False
+    for target in matching_targets:
+        # Getting the status of a target can mean reading its image, so this
+        # is done once per target.
+        target_status = target.status
+        if target_status == TargetStatuses.PROCESSING.value:
+            raise MatchingTargetsWithProcessingStatus
+
+        if not target.active_flag:
+            continue
+
+        if target.delete_date is None:
+            if target_status == TargetStatuses.SUCCESS.value:
+                not_deleted_matches.append(target)
+            continue
+
+        time_since_deletion = now - target.delete_date
+        if time_since_deletion < recognition_timedelta:
+            deletion_not_recognized_matches.append(target)
+        elif time_since_deletion < deletion_processing_timedelta:
+            active_matching_targets_delete_processing = True
+
+    if active_matching_targets_delete_processing:
+        raise ActiveMatchingTargetsDeleteProcessing
+
+    return not_deleted_matches + deletion_not_recognized_matches
 
 
 def get_query_match_response_text(
@@ -75,26 +118,19 @@ def get_query_match_response_text(
         ActiveMatchingTargetsDeleteProcessing: There is at least one active
             target which matches and was recently deleted.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
+    parsed = parse_multipart(
+        request_headers=request_headers,
+        request_body=request_body,
     )
 
-    [max_num_results] = parsed.get('max_num_results', ['1'])
+    max_num_results = int(parsed.get('max_num_results', ['1'])[0])
 
-    [include_target_data] = parsed.get('include_target_data', ['top'])
+    include_target_data = parsed.get('include_target_data', ['top'])[0]
     include_target_data = include_target_data.lower()
 
     [image_bytes] = parsed['image']
-    assert isinstance(image_bytes, bytes)
-    image = io.BytesIO(image_bytes)
-    gmt = ZoneInfo('GMT')
-    now = datetime.datetime.now(tz=gmt)
+    image_digest = hashlib.sha256(image_bytes).digest()
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
 
     processing_timedelta = datetime.timedelta(
         seconds=query_processes_deletion_seconds,
@@ -114,89 +150,43 @@ def get_query_match_response_text(
 
     assert isinstance(database, VuforiaDatabase)
 
+    # In the real Vuforia, this matching is fuzzy.
+    # For now, we check exact byte matching, by comparing digests.
+    #
+    # See https://github.com/VWS-Python/vws-python-mock/issues/3 for changing
+    # that.
     matching_targets = [
         target
         for target in database.targets
-        if _images_match(image=target.image, another_image=image)
-    ]
-
-    not_deleted_matches = [
-        target
-        for target in matching_targets
-        if target.active_flag
-        and not target.delete_date
-        and target.status == TargetStatuses.SUCCESS.value
+        if target.image_digest == image_digest
     ]
 
-    deletion_not_recognized_matches = [
-        target
-        for target in matching_targets
-        if target.active_flag
-        and target.delete_date
-        and (now - target.delete_date) < recognition_timedelta
-    ]
-
-    matching_targets_with_processing_status = [
-        target
-        for target in matching_targets
-        if target.status == TargetStatuses.PROCESSING.value
-    ]
-
-    active_matching_targets_delete_processing = [
-        target
-        for target in matching_targets
-        if target.active_flag
-        and target.delete_date
-        and (now - target.delete_date)
-        < (recognition_timedelta + processing_timedelta)
-        and target not in deletion_not_recognized_matches
-    ]
-
-    if matching_targets_with_processing_status:
-        raise MatchingTargetsWithProcessingStatus
-
-    if active_matching_targets_delete_processing:
-        raise ActiveMatchingTargetsDeleteProcessing
-
-    matches = not_deleted_matches + deletion_not_recognized_matches
+    matches = _get_recognized_matches(
+        matching_targets=matching_targets,
+        now=now,
+        recognition_timedelta=recognition_timedelta,
+        processing_timedelta=processing_timedelta,
+    )
 
     results: List[Dict[str, Any]] = []
-    for target in matches:
-        target_timestamp = target.last_modified_date.timestamp()
-        if target.application_metadata is None:
-            application_metadata = None
-        else:
-            application_metadata = base64.b64encode(
-                decode_base64(encoded_data=target.application_metadata),
-            ).decode('ascii')
-        target_data = {
-            'target_timestamp': int(target_timestamp),
-            'name': target.name,
-            'application_metadata': application_metadata,
-        }
-
-        if include_target_data == 'all':
-            result = {
-                'target_id': target.target_id,
-                'target_data': target_data,
-            }
-        elif include_target_data == 'top' and not results:
-            result = {
-                'target_id': target.target_id,
-                'target_data': target_data,
-            }
-        else:
-            result = {
-                'target_id': target.target_id,
+    for target in matches[:max_num_results]:
+        result: Dict[str, Any] = {'target_id': target.target_id}
+        if include_target_data == 'all' or (
+            include_target_data == 'top' and not results
+        ):
+            target_timestamp = target.last_modified_date.timestamp()
+            result['target_data'] = {
+                'target_timestamp': int(target_timestamp),
+                'name': target.name,
+                'application_metadata': target.query_application_metadata,
             }
 
         results.append(result)
 
-    results = results[: int(max_num_results)]
     body = {
         'result_code': ResultCodes.SUCCESS.value,
         'results': results,
-        'query_id': uuid.uuid4().hex,
+        'query_id': secrets.token_hex(16),
     }
 
     value = json_dump(body)
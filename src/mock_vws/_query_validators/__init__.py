@@ -7,13 +7,7 @@ from typing import Dict, Set
 from mock_vws.database import VuforiaDatabase
 
 from .accept_header_validators import validate_accept_header
-from .auth_validators import (
-    validate_auth_header_exists,
-    validate_auth_header_has_signature,
-    validate_auth_header_number_of_parts,
-    validate_authorization,
-    validate_client_key_exists,
-)
+from .auth_validators import validate_auth_header, validate_authorization
 from .content_length_validators import (
     validate_content_length_header_is_int,
     validate_content_length_header_not_too_large,
@@ -26,13 +20,7 @@ from .date_validators import (
     validate_date_in_range,
 )
 from .fields_validators import validate_extra_fields
-from .image_validators import (
-    validate_image_dimensions,
-    validate_image_field_given,
-    validate_image_file_size,
-    validate_image_format,
-    validate_image_is_image,
-)
+from .image_validators import validate_image
 from .include_target_data_validators import validate_include_target_data
 from .num_results_validators import validate_max_num_results
 from .project_state_validators import validate_project_state
@@ -64,10 +52,7 @@ def run_query_validators(
         request_headers=request_headers,
         request_body=request_body,
     )
-    validate_auth_header_exists(request_headers=request_headers)
-    validate_auth_header_number_of_parts(request_headers=request_headers)
-    validate_auth_header_has_signature(request_headers=request_headers)
-    validate_client_key_exists(
+    validate_auth_header(
         request_headers=request_headers,
         databases=databases,
     )
@@ -94,23 +79,7 @@ def run_query_validators(
         request_headers=request_headers,
         request_body=request_body,
     )
-    validate_image_field_given(
-        request_headers=request_headers,
-        request_body=request_body,
-    )
-    validate_image_is_image(
-        request_headers=request_headers,
-        request_body=request_body,
-    )
-    validate_image_format(
-        request_headers=request_headers,
-        request_body=request_body,
-    )
-    validate_image_dimensions(
-        request_headers=request_headers,
-        request_body=request_body,
-    )
-    validate_image_file_size(
+    validate_image(
         request_headers=request_headers,
         request_body=request_body,
     )
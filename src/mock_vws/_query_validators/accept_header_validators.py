@@ -6,6 +6,8 @@ from typing import Dict
 
 from mock_vws._query_validators.exceptions import InvalidAcceptHeader
 
+_ACCEPTED_ACCEPT_HEADERS = frozenset({'application/json', '*/*', None})
+
 
 def validate_accept_header(request_headers: Dict[str, str]) -> None:
     """
@@ -19,7 +21,7 @@ def validate_accept_header(request_headers: Dict[str, str]) -> None:
             'application/json' or '*/*'.
     """
     accept = request_headers.get('Accept')
-    if accept in ('application/json', '*/*', None):
+    if accept in _ACCEPTED_ACCEPT_HEADERS:
         return
 
     raise InvalidAcceptHeader
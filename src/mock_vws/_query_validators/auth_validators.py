@@ -5,6 +5,7 @@ Authorization validators to use in the mock query API.
 from typing import Dict, Set
 
 from mock_vws._database_matchers import get_database_matching_client_keys
+from mock_vws._mock_common import parse_authorization_header
 from mock_vws._query_validators.exceptions import (
     AuthenticationFailure,
     AuthHeaderMissing,
@@ -14,62 +15,48 @@ from mock_vws._query_validators.exceptions import (
 from mock_vws.database import VuforiaDatabase
 
 
-def validate_auth_header_exists(request_headers: Dict[str, str]) -> None:
-    """
-    Validate that there is an authorization header given to the query endpoint.
-
-    Args:
-        request_headers: The headers sent with the request.
-
-    Raises:
-        AuthHeaderMissing: There is no "Authorization" header.
-    """
-
-    if 'Authorization' in request_headers:
-        return
-
-    raise AuthHeaderMissing
-
-
-def validate_auth_header_number_of_parts(
-    request_headers: Dict[str, str],
-) -> None:
-    """
-    Validate the authorization header includes text either side of a space.
-
-    Args:
-        request_headers: The headers sent with the request.
-
-    Raises:
-        MalformedAuthHeader: The "Authorization" header is not as expected.
-    """
-
-    header = request_headers['Authorization']
-    parts = header.split(' ')
-    if len(parts) == 2 and parts[1]:
-        return
-
-    raise MalformedAuthHeader
-
-
-def validate_client_key_exists(
+def validate_auth_header(
     request_headers: Dict[str, str],
     databases: Set[VuforiaDatabase],
 ) -> None:
     """
-    Validate the authorization header includes a client key for a database.
+    Validate that the authorization header given to the query endpoint is
+    well formed and includes a client key for a database.
+
+    The checks are made in one pass over the header, in the order that
+    Vuforia makes them.
 
     Args:
         request_headers: The headers sent with the request.
         databases: All Vuforia databases.
 
     Raises:
+        AuthHeaderMissing: There is no "Authorization" header.
+        MalformedAuthHeader: The "Authorization" header does not include text
+            either side of exactly one space.
+        QueryOutOfBounds: The "Authorization" header has no signature.
         AuthenticationFailure: The client key is unknown.
     """
-
-    header = request_headers['Authorization']
-    first_part, _ = header.split(':')
-    _, access_key = first_part.split(' ')
+    header = request_headers.get('Authorization')
+    if header is None:
+        raise AuthHeaderMissing
+
+    last_index = len(header) - 1
+    space_index = header.find(' ')
+    if (
+        space_index in (-1, last_index)
+        or header.find(' ', space_index + 1) != -1
+    ):
+        raise MalformedAuthHeader
+
+    colon_index = header.find(':')
+    if (
+        colon_index in (-1, last_index)
+        or header.find(':', colon_index + 1) != -1
+    ):
+        raise QueryOutOfBounds
+
+    access_key, _ = parse_authorization_header(authorization_header=header)
     for database in databases:
         if access_key == database.client_access_key:
             return
@@ -77,26 +64,6 @@ def validate_client_key_exists(
     raise AuthenticationFailure
 
 
-def validate_auth_header_has_signature(
-    request_headers: Dict[str, str],
-) -> None:
-    """
-    Validate the authorization header includes a signature.
-
-    Args:
-        request_headers: The headers sent with the request.
-
-    Raises:
-        QueryOutOfBounds: The "Authorization" header has no signature.
-    """
-
-    header = request_headers['Authorization']
-    if header.count(':') == 1 and header.split(':')[1]:
-        return
-
-    raise QueryOutOfBounds
-
-
 def validate_authorization(
     request_path: str,
     request_headers: Dict[str, str],
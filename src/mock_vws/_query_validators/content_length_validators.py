@@ -25,6 +25,12 @@ def validate_content_length_header_is_int(
     """
     given_content_length = request_headers['Content-Length']
 
+    # Headers are almost always only decimal digits, which ``int`` accepts.
+    # Other values, such as ones with a sign or surrounding whitespace, may
+    # still be accepted by ``int``.
+    if given_content_length.isdecimal():
+        return
+
     try:
         int(given_content_length)
     except ValueError as exc:
@@ -48,7 +54,7 @@ def validate_content_length_header_not_too_large(
     """
     given_content_length = request_headers['Content-Length']
 
-    body_length = len(request_body if request_body else b'')
+    body_length = len(request_body) if request_body else 0
     given_content_length_value = int(given_content_length)
     if given_content_length_value > body_length:
         raise ContentLengthHeaderTooLarge
@@ -71,7 +77,7 @@ def validate_content_length_header_not_too_small(
     """
     given_content_length = request_headers['Content-Length']
 
-    body_length = len(request_body if request_body else b'')
+    body_length = len(request_body) if request_body else 0
     given_content_length_value = int(given_content_length)
 
     if given_content_length_value < body_length:
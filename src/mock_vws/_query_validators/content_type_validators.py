@@ -2,9 +2,9 @@
 Validators for the ``Content-Type`` header.
 """
 
-import cgi
 from typing import Dict
 
+from mock_vws._mock_common import parse_content_type
 from mock_vws._query_validators.exceptions import (
     BoundaryNotInBody,
     NoBoundaryFound,
@@ -31,12 +31,12 @@ def validate_content_type_header(
         BoundaryNotInBody: The boundary is not in the request body.
     """
     content_type_header = request_headers.get('Content-Type', '')
-    main_value, pdict = cgi.parse_header(content_type_header)
+    main_value, boundary = parse_content_type(content_type_header)
     if main_value != 'multipart/form-data':
         raise UnsupportedMediaType
 
-    if 'boundary' not in pdict:
+    if boundary is None:
         raise NoBoundaryFound
 
-    if pdict['boundary'].encode() not in request_body:
+    if boundary not in request_body:
         raise BoundaryNotInBody
@@ -3,9 +3,9 @@ Validators of the date header to use in the mock query API.
 """
 
 import datetime
-from typing import Dict, Set
-
-from backports.zoneinfo import ZoneInfo
+import functools
+import time
+from typing import Dict, Optional
 
 from mock_vws._query_validators.exceptions import (
     DateFormatNotValid,
@@ -30,25 +30,43 @@ def validate_date_header_given(request_headers: Dict[str, str]) -> None:
     raise DateHeaderNotGiven
 
 
-def _accepted_date_formats() -> Set[str]:
-    """
-    Return all known accepted date formats.
+# These are all known accepted date formats.
+# We expect that more formats than this will be accepted.
+# These are the accepted ones we know of at the time of writing.
+_BASE_ACCEPTED_DATE_FORMATS = (
+    '%a, %b %d %H:%M:%S %Y',
+    '%a %b %d %H:%M:%S %Y',
+    '%a, %d %b %Y %H:%M:%S',
+    '%a %d %b %Y %H:%M:%S',
+)
+
+_ACCEPTED_DATE_FORMATS = _BASE_ACCEPTED_DATE_FORMATS + tuple(
+    date_format + ' GMT' for date_format in _BASE_ACCEPTED_DATE_FORMATS
+)
+
 
-    We expect that more formats than this will be accepted.
-    These are the accepted ones we know of at the time of writing.
+@functools.lru_cache(maxsize=64)
+def _parse_date_header(date_header: str) -> Optional[datetime.datetime]:
     """
-    known_accepted_formats = {
-        '%a, %b %d %H:%M:%S %Y',
-        '%a %b %d %H:%M:%S %Y',
-        '%a, %d %b %Y %H:%M:%S',
-        '%a %d %b %Y %H:%M:%S',
-    }
+    Parse a ``Date`` header in the first accepted format which matches it.
 
-    known_accepted_formats = known_accepted_formats.union(
-        set(date_format + ' GMT' for date_format in known_accepted_formats),
-    )
+    The same header is parsed by multiple validators for each query request,
+    so results are cached.
+
+    Args:
+        date_header: The ``Date`` header sent with a request.
+
+    Returns:
+        The date given in the header, or ``None`` if the header is not in an
+        accepted format.
+    """
+    for date_format in _ACCEPTED_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(date_header, date_format)
+        except ValueError:
+            pass
 
-    return known_accepted_formats
+    return None
 
 
 def validate_date_format(request_headers: Dict[str, str]) -> None:
@@ -61,15 +79,9 @@ def validate_date_format(request_headers: Dict[str, str]) -> None:
     Raises:
         DateFormatNotValid: The date is in the wrong format.
     """
-    date_header = request_headers['Date']
-
-    for date_format in _accepted_date_formats():
-        try:
-            datetime.datetime.strptime(date_header, date_format)
-        except ValueError:
-            pass
-        else:
-            return
+    date = _parse_date_header(date_header=request_headers['Date'])
+    if date is not None:
+        return
 
     raise DateFormatNotValid
 
@@ -84,24 +96,15 @@ def validate_date_in_range(request_headers: Dict[str, str]) -> None:
     Raises:
         RequestTimeTooSkewed: The date is out of range.
     """
-    date_header = request_headers['Date']
-
-    for date_format in _accepted_date_formats():
-        try:
-            date = datetime.datetime.strptime(date_header, date_format)
-            # We could break here but that would give a coverage report that is
-            # not 100%.
-        except ValueError:
-            pass
+    date = _parse_date_header(date_header=request_headers['Date'])
+    assert isinstance(date, datetime.datetime)
 
-    gmt = ZoneInfo('GMT')
-    now = datetime.datetime.now(tz=gmt)
-    date_from_header = date.replace(tzinfo=gmt)
-    time_difference = now - date_from_header
+    date_from_header = date.replace(tzinfo=datetime.timezone.utc)
+    time_difference = time.time() - date_from_header.timestamp()
 
-    maximum_time_difference = datetime.timedelta(minutes=65)
+    maximum_time_difference_seconds = 65 * 60
 
-    if abs(time_difference) < maximum_time_difference:
+    if abs(time_difference) < maximum_time_difference_seconds:
         return
 
     raise RequestTimeTooSkewed
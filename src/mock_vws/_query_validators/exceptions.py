@@ -2,15 +2,56 @@
 Exceptions to raise from validators.
 """
 
-import uuid
+import secrets
 from http import HTTPStatus
 from pathlib import Path
+from typing import Dict
 
 from mock_vws._constants import ResultCodes
-from mock_vws._mock_common import json_dump
+from mock_vws._mock_common import transaction_result_body
 
+# The response has an unusual format of separators, so we construct it
+# manually.
+# Only the transaction ID varies between responses.
+_INACTIVE_PROJECT_RESPONSE_TEMPLATE = (
+    '{{"transaction_id": "{transaction_id}",'
+    f'"result_code":"{ResultCodes.INACTIVE_PROJECT.value}"'
+    '}}'
+)
 
-class DateHeaderNotGiven(Exception):
+# This is decoded with the charset which is given in the ``Content-Type`` of
+# the response.
+_QUERY_OUT_OF_BOUNDS_RESPONSE_TEXT = (
+    Path(__file__).parent / 'resources' / 'query_out_of_bounds_response.html'
+).read_text(encoding='iso-8859-1')
+
+
+class ValidatorException(Exception):
+    """
+    A base class for exceptions thrown from mock Vuforia query endpoint
+    validators.
+
+    Attributes:
+        status_code: The status code to use in a response if this is raised.
+        response_text: The response text to use in a response if this is
+            raised.
+    """
+
+    status_code: int
+    response_text: str
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        By default, the headers are not changed.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+
+
+class DateHeaderNotGiven(ValidatorException):
     """
     Exception raised when a date header is not given.
     """
@@ -27,8 +68,17 @@ class DateHeaderNotGiven(Exception):
         self.status_code = HTTPStatus.BAD_REQUEST
         self.response_text = 'Date header required.'
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class DateFormatNotValid(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/plain; charset=ISO-8859-1'
+
+
+class DateFormatNotValid(ValidatorException):
     """
     Exception raised when the date format is not valid.
     """
@@ -45,8 +95,18 @@ class DateFormatNotValid(Exception):
         self.status_code = HTTPStatus.UNAUTHORIZED
         self.response_text = 'Malformed date header.'
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class RequestTimeTooSkewed(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/plain; charset=ISO-8859-1'
+        headers['WWW-Authenticate'] = 'VWS'
+
+
+class RequestTimeTooSkewed(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'RequestTimeTooSkewed'.
@@ -62,14 +122,12 @@ class RequestTimeTooSkewed(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.FORBIDDEN
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.REQUEST_TIME_TOO_SKEWED.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.REQUEST_TIME_TOO_SKEWED
+        )
 
 
-class BadImage(Exception):
+class BadImage(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'BadImage'.
@@ -85,7 +143,7 @@ class BadImage(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
-        transaction_id = uuid.uuid4().hex
+        transaction_id = secrets.token_hex(16)
         result_code = ResultCodes.BAD_IMAGE.value
 
         # The response has an unusual format of separators, so we construct it
@@ -98,7 +156,7 @@ class BadImage(Exception):
         )
 
 
-class AuthenticationFailure(Exception):
+class AuthenticationFailure(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure'.
@@ -114,7 +172,7 @@ class AuthenticationFailure(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNAUTHORIZED
-        transaction_id = uuid.uuid4().hex
+        transaction_id = secrets.token_hex(16)
         result_code = ResultCodes.AUTHENTICATION_FAILURE.value
 
         # The response has an unusual format of separators, so we construct it
@@ -126,8 +184,17 @@ class AuthenticationFailure(Exception):
             '}'
         )
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class AuthenticationFailureGoodFormatting(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['WWW-Authenticate'] = 'VWS'
+
+
+class AuthenticationFailureGoodFormatting(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure' with a standard JSON formatting.
@@ -144,14 +211,21 @@ class AuthenticationFailureGoodFormatting(Exception):
         super().__init__()
         self.status_code = HTTPStatus.UNAUTHORIZED
 
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.AUTHENTICATION_FAILURE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.AUTHENTICATION_FAILURE
+        )
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['WWW-Authenticate'] = 'VWS'
 
 
-class ImageNotGiven(Exception):
+class ImageNotGiven(ValidatorException):
     """
     Exception raised when an image is not given.
     """
@@ -169,7 +243,7 @@ class ImageNotGiven(Exception):
         self.response_text = 'No image.'
 
 
-class AuthHeaderMissing(Exception):
+class AuthHeaderMissing(ValidatorException):
     """
     Exception raised when an auth header is not given.
     """
@@ -186,8 +260,18 @@ class AuthHeaderMissing(Exception):
         self.status_code = HTTPStatus.UNAUTHORIZED
         self.response_text = 'Authorization header missing.'
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class MalformedAuthHeader(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/plain; charset=ISO-8859-1'
+        headers['WWW-Authenticate'] = 'VWS'
+
+
+class MalformedAuthHeader(ValidatorException):
     """
     Exception raised when an auth header is not given.
     """
@@ -204,8 +288,18 @@ class MalformedAuthHeader(Exception):
         self.status_code = HTTPStatus.UNAUTHORIZED
         self.response_text = 'Malformed authorization header.'
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/plain; charset=ISO-8859-1'
+        headers['WWW-Authenticate'] = 'VWS'
+
 
-class UnknownParameters(Exception):
+class UnknownParameters(ValidatorException):
     """
     Exception raised when unknown parameters are given.
     """
@@ -223,7 +317,7 @@ class UnknownParameters(Exception):
         self.response_text = 'Unknown parameters in the request.'
 
 
-class InactiveProject(Exception):
+class InactiveProject(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'InactiveProject'.
@@ -239,19 +333,12 @@ class InactiveProject(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.FORBIDDEN
-        transaction_id = uuid.uuid4().hex
-        result_code = ResultCodes.INACTIVE_PROJECT.value
-        # The response has an unusual format of separators, so we construct it
-        # manually.
-        self.response_text = (
-            '{"transaction_id": '
-            f'"{transaction_id}",'
-            f'"result_code":"{result_code}"'
-            '}'
+        self.response_text = _INACTIVE_PROJECT_RESPONSE_TEMPLATE.format(
+            transaction_id=secrets.token_hex(16),
         )
 
 
-class InvalidMaxNumResults(Exception):
+class InvalidMaxNumResults(ValidatorException):
     """
     Exception raised when an invalid value is given as the
     "max_num_results" field.
@@ -274,7 +361,7 @@ class InvalidMaxNumResults(Exception):
         self.response_text = invalid_value_message
 
 
-class MaxNumResultsOutOfRange(Exception):
+class MaxNumResultsOutOfRange(ValidatorException):
     """
     Exception raised when an integer value is given as the "max_num_results"
     field which is out of range.
@@ -297,7 +384,7 @@ class MaxNumResultsOutOfRange(Exception):
         self.response_text = integer_out_of_range_message
 
 
-class InvalidIncludeTargetData(Exception):
+class InvalidIncludeTargetData(ValidatorException):
     """
     Exception raised when an invalid value is given as the
     "include_target_data" field.
@@ -322,7 +409,7 @@ class InvalidIncludeTargetData(Exception):
         self.response_text = unexpected_target_data_message
 
 
-class UnsupportedMediaType(Exception):
+class UnsupportedMediaType(ValidatorException):
     """
     Exception raised when no boundary is found for multipart data.
     """
@@ -339,8 +426,17 @@ class UnsupportedMediaType(Exception):
         self.status_code = HTTPStatus.UNSUPPORTED_MEDIA_TYPE
         self.response_text = ''
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class InvalidAcceptHeader(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.pop('Content-Type')
+
+
+class InvalidAcceptHeader(ValidatorException):
     """
     Exception raised when there is an invalid accept header given.
     """
@@ -357,8 +453,17 @@ class InvalidAcceptHeader(Exception):
         self.status_code = HTTPStatus.NOT_ACCEPTABLE
         self.response_text = ''
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class BoundaryNotInBody(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.pop('Content-Type')
+
+
+class BoundaryNotInBody(ValidatorException):
     """
     Exception raised when the form boundary is not in the request body.
     """
@@ -378,8 +483,17 @@ class BoundaryNotInBody(Exception):
             'Could find no Content-Disposition header within part'
         )
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class NoBoundaryFound(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/html;charset=UTF-8'
+
+
+class NoBoundaryFound(ValidatorException):
     """
     Exception raised when an invalid media type is given.
     """
@@ -399,8 +513,17 @@ class NoBoundaryFound(Exception):
             'Unable to get boundary for multipart'
         )
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/html;charset=UTF-8'
 
-class QueryOutOfBounds(Exception):
+
+class QueryOutOfBounds(ValidatorException):
     """
     Exception raised when VWS returns an HTML page which says that there is a
     particular out of bounds error.
@@ -416,14 +539,20 @@ class QueryOutOfBounds(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-        resources_dir = Path(__file__).parent / 'resources'
-        filename = 'query_out_of_bounds_response.html'
-        oops_resp_file = resources_dir / filename
-        text = str(oops_resp_file.read_text())
-        self.response_text = text
+        self.response_text = _QUERY_OUT_OF_BOUNDS_RESPONSE_TEXT
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/html; charset=ISO-8859-1'
+        headers['Cache-Control'] = 'must-revalidate,no-cache,no-store'
 
 
-class ContentLengthHeaderTooLarge(Exception):
+class ContentLengthHeaderTooLarge(ValidatorException):
     """
     Exception raised when the given content length header is too large.
     """
@@ -440,8 +569,18 @@ class ContentLengthHeaderTooLarge(Exception):
         self.status_code = HTTPStatus.GATEWAY_TIMEOUT
         self.response_text = ''
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.clear()
+        headers['Connection'] = 'keep-alive'
+
 
-class ContentLengthHeaderNotInt(Exception):
+class ContentLengthHeaderNotInt(ValidatorException):
     """
     Exception raised when the given content length header is not an integer.
     """
@@ -457,3 +596,13 @@ class ContentLengthHeaderNotInt(Exception):
         super().__init__()
         self.status_code = HTTPStatus.BAD_REQUEST
         self.response_text = ''
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.clear()
+        headers['Connection'] = 'Close'
@@ -2,12 +2,15 @@
 Validators for the fields given.
 """
 
-import cgi
-import io
 from typing import Dict
 
+from mock_vws._mock_common import parse_multipart
 from mock_vws._query_validators.exceptions import UnknownParameters
 
+_KNOWN_PARAMETERS = frozenset(
+    {'image', 'max_num_results', 'include_target_data'},
+)
+
 
 def validate_extra_fields(
     request_headers: Dict[str, str],
@@ -23,19 +26,12 @@ def validate_extra_fields(
     Raises:
         UnknownParameters: Extra fields are given.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
+    parsed = parse_multipart(
+        request_headers=request_headers,
+        request_body=request_body,
     )
 
-    known_parameters = {'image', 'max_num_results', 'include_target_data'}
-
-    if not parsed.keys() - known_parameters:
+    if not parsed.keys() - _KNOWN_PARAMETERS:
         return
 
     raise UnknownParameters
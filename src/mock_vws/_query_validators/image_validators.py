@@ -2,184 +2,91 @@
 Input validators for the image field use in the mock query API.
 """
 
-import cgi
+import functools
 import io
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import requests
 from PIL import Image
 
+from mock_vws._mock_common import parse_multipart
 from mock_vws._query_validators.exceptions import BadImage, ImageNotGiven
 
+# This is the documented maximum size of a PNG as per.
+# https://library.vuforia.com/articles/Solution/How-To-Perform-an-Image-Recognition-Query.
+# However, the tests show that this maximum size also applies to JPEG files.
+_MAX_IMAGE_BYTES = 2 * 1024 * 1024
 
-def validate_image_field_given(
-    request_headers: Dict[str, str],
-    request_body: bytes,
-) -> None:
+
+@functools.lru_cache(maxsize=1)
+def _image_format_and_size(image: bytes) -> Tuple[Optional[str], int, int]:
     """
-    Validate that the image field is given.
+    Get the format, width and height of an image.
+
+    The same image is often given in many query requests, so these values for
+    the most recently given image are kept.
+    Pixel data is not decoded, and the image file is closed before returning.
 
     Args:
-        request_headers: The headers sent with the request.
-        request_body: The body of the request.
+        image: The image data.
+
+    Returns:
+        The format, the width and the height of the image.
 
     Raises:
-        ImageNotGiven: The image field is not given.
+        OSError: The given data is not an image file.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
-    )
-
-    if 'image' in parsed.keys():
-        return
-
-    raise ImageNotGiven
+    with Image.open(io.BytesIO(image)) as pil_image:
+        return pil_image.format, pil_image.width, pil_image.height
 
 
-def validate_image_file_size(
+def validate_image(
     request_headers: Dict[str, str],
     request_body: bytes,
 ) -> None:
     """
-    Validate the file size of the image given to the query endpoint.
+    Validate the image given to the query endpoint.
+
+    The checks are made in one validator so that the image is taken from the
+    parsed body once, and its details are read through a cache.
+    They are made in the order that Vuforia makes them.
 
     Args:
         request_headers: The headers sent with the request.
         request_body: The body of the request.
 
     Raises:
+        ImageNotGiven: The image field is not given.
+        BadImage: The image is not an image file, is not either a PNG or a
+            JPEG, or is not within the maximum width and height limits.
         requests.exceptions.ConnectionError: The image file size is too large.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
+    parsed = parse_multipart(
+        request_headers=request_headers,
+        request_body=request_body,
     )
 
-    [image] = parsed['image']
-
-    # This is the documented maximum size of a PNG as per.
-    # https://library.vuforia.com/articles/Solution/How-To-Perform-an-Image-Recognition-Query.
-    # However, the tests show that this maximum size also applies to JPEG
-    # files.
-    max_bytes = 2 * 1024 * 1024
-    if len(image) > max_bytes:
-        raise requests.exceptions.ConnectionError
-
+    if 'image' not in parsed:
+        raise ImageNotGiven
 
-def validate_image_dimensions(
-    request_headers: Dict[str, str],
-    request_body: bytes,
-) -> None:
-    """
-    Validate the dimensions the image given to the query endpoint.
+    [image] = parsed['image']
 
-    Args:
-        request_headers: The headers sent with the request.
-        request_body: The body of the request.
+    try:
+        image_format, width, height = _image_format_and_size(image=image)
+    except OSError as exc:
+        raise BadImage from exc
 
-    Raises:
-        BadImage: The image is given and is not within the maximum width and
-            height limits.
-    """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
-    )
+    if image_format not in ('PNG', 'JPEG'):
+        raise BadImage
 
-    [image] = parsed['image']
-    assert isinstance(image, bytes)
-    image_file = io.BytesIO(image)
-    pil_image = Image.open(image_file)
     max_width = 30000
     max_height = 30000
-    if pil_image.height <= max_height and pil_image.width <= max_width:
-        return
-
-    raise BadImage
+    if height > max_height or width > max_width:
+        raise BadImage
 
-
-def validate_image_format(
-    request_headers: Dict[str, str],
-    request_body: bytes,
-) -> None:
-    """
-    Validate the format of the image given to the query endpoint.
-
-    Args:
-        request_headers: The headers sent with the request.
-        request_body: The body of the request.
-
-    Raises:
-        BadImage: The image is given and is not either a PNG or a JPEG.
-    """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
-    )
-
-    [image] = parsed['image']
-
-    assert isinstance(image, bytes)
-    image_file = io.BytesIO(image)
-    pil_image = Image.open(image_file)
-
-    if pil_image.format in ('PNG', 'JPEG'):
+    # The image is part of the body, so it cannot be larger than the body.
+    if len(request_body) <= _MAX_IMAGE_BYTES:
         return
 
-    raise BadImage
-
-
-def validate_image_is_image(
-    request_headers: Dict[str, str],
-    request_body: bytes,
-) -> None:
-    """
-    Validate that the given image data is actually an image file.
-
-    Args:
-        request_headers: The headers sent with the request.
-        request_body: The body of the request.
-
-    Raises:
-        BadImage: Image data is given and it is not an image file.
-    """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
-    )
-
-    [image] = parsed['image']
-
-    assert isinstance(image, bytes)
-    image_file = io.BytesIO(image)
-
-    try:
-        Image.open(image_file)
-    except OSError as exc:
-        raise BadImage from exc
+    if len(image) > _MAX_IMAGE_BYTES:
+        raise requests.exceptions.ConnectionError
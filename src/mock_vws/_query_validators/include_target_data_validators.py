@@ -2,12 +2,13 @@
 Validators for the ``include_target_data`` field.
 """
 
-import cgi
-import io
 from typing import Dict
 
+from mock_vws._mock_common import parse_multipart
 from mock_vws._query_validators.exceptions import InvalidIncludeTargetData
 
+_ALLOWED_INCLUDE_TARGET_DATA = frozenset({'top', 'all', 'none'})
+
 
 def validate_include_target_data(
     request_headers: Dict[str, str],
@@ -25,20 +26,14 @@ def validate_include_target_data(
         InvalidIncludeTargetData: The ``include_target_data`` field is not an
             accepted value.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
+    parsed = parse_multipart(
+        request_headers=request_headers,
+        request_body=request_body,
     )
 
-    [include_target_data] = parsed.get('include_target_data', ['top'])
+    include_target_data = parsed.get('include_target_data', ['top'])[0]
     lower_include_target_data = include_target_data.lower()
-    allowed_included_target_data = {'top', 'all', 'none'}
-    if lower_include_target_data in allowed_included_target_data:
+    if lower_include_target_data in _ALLOWED_INCLUDE_TARGET_DATA:
         return
 
     assert isinstance(include_target_data, str)
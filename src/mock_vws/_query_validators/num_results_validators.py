@@ -2,15 +2,16 @@
 Validators for the ``max_num_results`` fields.
 """
 
-import cgi
-import io
 from typing import Dict
 
+from mock_vws._mock_common import parse_multipart
 from mock_vws._query_validators.exceptions import (
     InvalidMaxNumResults,
     MaxNumResultsOutOfRange,
 )
 
+_JAVA_MAX_INT = 2147483647
+
 
 def validate_max_num_results(
     request_headers: Dict[str, str],
@@ -29,16 +30,11 @@ def validate_max_num_results(
             less than or equal to the max integer in Java.
         MaxNumResultsOutOfRange: The ``max_num_results`` given is not in range.
     """
-    body_file = io.BytesIO(request_body)
-
-    _, pdict = cgi.parse_header(request_headers['Content-Type'])
-    parsed = cgi.parse_multipart(
-        fp=body_file,
-        pdict={
-            'boundary': pdict['boundary'].encode(),
-        },
+    parsed = parse_multipart(
+        request_headers=request_headers,
+        request_body=request_body,
     )
-    [max_num_results] = parsed.get('max_num_results', ['1'])
+    max_num_results = parsed.get('max_num_results', ['1'])[0]
     assert isinstance(max_num_results, str)
 
     try:
@@ -46,9 +42,8 @@ def validate_max_num_results(
     except ValueError as exc:
         raise InvalidMaxNumResults(given_value=max_num_results) from exc
 
-    java_max_int = 2147483647
-    if max_num_results_int > java_max_int:
+    if max_num_results_int > _JAVA_MAX_INT:
         raise InvalidMaxNumResults(given_value=max_num_results)
 
-    if max_num_results_int < 1 or max_num_results_int > 50:
+    if not 1 <= max_num_results_int <= 50:
         raise MaxNumResultsOutOfRange(given_value=max_num_results)
@@ -5,139 +5,80 @@ See
 https://library.vuforia.com/articles/Solution/How-To-Perform-an-Image-Recognition-Query
 """
 
+import functools
 from http import HTTPStatus
 from pathlib import Path
-from typing import Any, Callable, Dict, Set, Tuple, Union
+from typing import Any, Callable, Set, Union
 
-import wrapt
 from requests_mock import POST
 from requests_mock.request import _RequestObjectProxy
 from requests_mock.response import _Context
 
-from mock_vws._mock_common import (
-    Route,
-    set_content_length_header,
-    set_date_header,
-)
+from mock_vws._mock_common import Route, set_response_headers
 from mock_vws._query_tools import (
     ActiveMatchingTargetsDeleteProcessing,
     MatchingTargetsWithProcessingStatus,
     get_query_match_response_text,
 )
 from mock_vws._query_validators import run_query_validators
-from mock_vws._query_validators.exceptions import (
-    AuthenticationFailure,
-    AuthenticationFailureGoodFormatting,
-    AuthHeaderMissing,
-    BadImage,
-    BoundaryNotInBody,
-    ContentLengthHeaderNotInt,
-    ContentLengthHeaderTooLarge,
-    DateFormatNotValid,
-    DateHeaderNotGiven,
-    ImageNotGiven,
-    InactiveProject,
-    InvalidAcceptHeader,
-    InvalidIncludeTargetData,
-    InvalidMaxNumResults,
-    MalformedAuthHeader,
-    MaxNumResultsOutOfRange,
-    NoBoundaryFound,
-    QueryOutOfBounds,
-    RequestTimeTooSkewed,
-    UnknownParameters,
-    UnsupportedMediaType,
-)
+from mock_vws._query_validators.exceptions import ValidatorException
 from mock_vws.database import VuforiaDatabase
 
-ROUTES = set([])
+ROUTES: Set[Route] = set()
+
+# Endpoints give text to ``requests_mock``, so this is decoded once here with
+# the charset which is given in the ``Content-Type`` of the response.
+_MATCH_PROCESSING_RESPONSE_TEXT = (
+    Path(__file__).parent.parent
+    / 'resources'
+    / 'match_processing_response.html'
+).read_text(encoding='iso-8859-1')
 
 
-@wrapt.decorator
-def run_validators(
-    wrapped: Callable[..., str],
-    instance: Any,
-    args: Tuple[_RequestObjectProxy, _Context],
-    kwargs: Dict,
-) -> str:
+def run_validators(wrapped: Callable[..., str]) -> Callable[..., str]:
     """
     Run all validators for the query endpoint.
 
     Args:
         wrapped: An endpoint function for `requests_mock`.
-        instance: The class that the endpoint function is in.
-        args: The arguments given to the endpoint function.
-        kwargs: The keyword arguments given to the endpoint function.
 
     Returns:
-        The result of calling the endpoint.
+        The endpoint function, wrapped so that validators are run first.
     """
-    request, context = args
-    try:
-        run_query_validators(
-            request_path=request.path,
-            request_headers=request.headers,
-            request_body=request.body,
-            request_method=request.method,
-            databases=instance.databases,
-        )
-    except DateHeaderNotGiven as exc:
-        content_type = 'text/plain; charset=ISO-8859-1'
-        context.headers['Content-Type'] = content_type
-        context.status_code = exc.status_code
-        return exc.response_text
-    except (
-        AuthHeaderMissing,
-        DateFormatNotValid,
-        MalformedAuthHeader,
-    ) as exc:
-        content_type = 'text/plain; charset=ISO-8859-1'
-        context.headers['Content-Type'] = content_type
-        context.headers['WWW-Authenticate'] = 'VWS'
-        context.status_code = exc.status_code
-        return exc.response_text
-    except (AuthenticationFailure, AuthenticationFailureGoodFormatting) as exc:
-        context.headers['WWW-Authenticate'] = 'VWS'
-        context.status_code = exc.status_code
-        return exc.response_text
-    except (
-        RequestTimeTooSkewed,
-        ImageNotGiven,
-        UnknownParameters,
-        InactiveProject,
-        InvalidIncludeTargetData,
-        InvalidMaxNumResults,
-        MaxNumResultsOutOfRange,
-        BadImage,
-    ) as exc:
-        context.status_code = exc.status_code
-        return exc.response_text
-    except (UnsupportedMediaType, InvalidAcceptHeader) as exc:
-        context.headers.pop('Content-Type')
-        context.status_code = exc.status_code
-        return exc.response_text
-    except (NoBoundaryFound, BoundaryNotInBody) as exc:
-        content_type = 'text/html;charset=UTF-8'
-        context.headers['Content-Type'] = content_type
-        context.status_code = exc.status_code
-        return exc.response_text
-    except QueryOutOfBounds as exc:
-        content_type = 'text/html; charset=ISO-8859-1'
-        context.headers['Content-Type'] = content_type
-        cache_control = 'must-revalidate,no-cache,no-store'
-        context.headers['Cache-Control'] = cache_control
-        context.status_code = exc.status_code
-        return exc.response_text
-    except ContentLengthHeaderNotInt as exc:
-        context.headers = {'Connection': 'Close'}
-        context.status_code = exc.status_code
-        return exc.response_text
-    except ContentLengthHeaderTooLarge as exc:
-        context.headers = {'Connection': 'keep-alive'}
-        context.status_code = exc.status_code
-        return exc.response_text
-
-    return wrapped(*args, **kwargs)
+
+    @functools.wraps(wrapped)
+    def wrapper(
+        instance: Any,
+        request: _RequestObjectProxy,
+        context: _Context,
+    ) -> str:
+        """
+        Run all validators, then call the endpoint if none of them fail.
+
+        Args:
+            instance: The class that the endpoint function is in.
+            request: The request to the endpoint.
+            context: The context of the response.
+
+        Returns:
+            The result of calling the endpoint, or an error response.
+        """
+        try:
+            run_query_validators(
+                request_path=request.path,
+                request_headers=request.headers,
+                request_body=request.body,
+                request_method=request.method,
+                databases=instance.databases,
+            )
+        except ValidatorException as exc:
+            exc.set_response_headers(headers=context.headers)
+            context.status_code = exc.status_code
+            return exc.response_text
+
+        return wrapped(instance, request, context)
+
+    return wrapper
 
 
 def route(
@@ -174,15 +115,11 @@ def route(
 
         decorators = [
             run_validators,
-            set_date_header,
-            set_content_length_header,
+            set_response_headers,
         ]
 
         for decorator in decorators:
-            # See https://github.com/PyCQA/pylint/issues/259
-            method = decorator(  # pylint: disable=no-value-for-parameter
-                method,
-            )
+            method = decorator(method)
 
         return method
 
@@ -215,7 +152,7 @@ class MockVuforiaWebQueryAPI:
             databases: Target databases.
         """
         self.routes: Set[Route] = ROUTES
-        self.databases: Set[VuforiaDatabase] = set([])
+        self.databases: Set[VuforiaDatabase] = set()
         self._query_processes_deletion_seconds = (
             query_processes_deletion_seconds
         )
@@ -257,14 +194,11 @@ class MockVuforiaWebQueryAPI:
             # processing status, but we choose to:
             # * Do the most unexpected thing.
             # * Be consistent with every response.
-            resources_dir = Path(__file__).parent.parent / 'resources'
-            filename = 'match_processing_response.html'
-            match_processing_resp_file = resources_dir / filename
             context.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
             cache_control = 'must-revalidate,no-cache,no-store'
             context.headers['Cache-Control'] = cache_control
             content_type = 'text/html; charset=ISO-8859-1'
             context.headers['Content-Type'] = content_type
-            return Path(match_processing_resp_file).read_text()
+            return _MATCH_PROCESSING_RESPONSE_TEXT
 
         return response_text
@@ -5,137 +5,115 @@ See
 https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API
 """
 
-import base64
 import datetime
+import functools
 import io
-import itertools
 import random
-import uuid
+import secrets
 from http import HTTPStatus
-from typing import Any, Callable, Dict, List, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Set, Union
 
-import wrapt
-from backports.zoneinfo import ZoneInfo
-from PIL import Image
 from requests_mock import DELETE, GET, POST, PUT
 from requests_mock.request import _RequestObjectProxy
 from requests_mock.response import _Context
 
+from mock_vws._base64_decoding import decode_base64
 from mock_vws._constants import ResultCodes, TargetStatuses
 from mock_vws._database_matchers import get_database_matching_server_keys
 from mock_vws._mock_common import (
     Route,
     json_dump,
-    set_content_length_header,
-    set_date_header,
+    parse_json,
+    set_response_headers,
+    transaction_result_body,
 )
 from mock_vws._services_validators import run_services_validators
-from mock_vws._services_validators.exceptions import (
-    AuthenticationFailure,
-    BadImage,
-    ContentLengthHeaderNotInt,
-    ContentLengthHeaderTooLarge,
-    Fail,
-    ImageTooLarge,
-    MetadataTooLarge,
-    OopsErrorOccurredResponse,
-    ProjectInactive,
-    RequestTimeTooSkewed,
-    TargetNameExist,
-    UnknownTarget,
-    UnnecessaryRequestBody,
-)
+from mock_vws._services_validators.exceptions import ValidatorException
 from mock_vws.database import VuforiaDatabase
 from mock_vws.target import Target
 
 _TARGET_ID_PATTERN = '[A-Za-z0-9]+'
 
+# The database summary response always has the same shape, so its body is
+# filled in from a template rather than built as a dictionary and serialized.
+# This gives the same output as ``json_dump``.
+_DATABASE_SUMMARY_TEMPLATE = (
+    '{{"result_code":"{result_code}",'
+    '"transaction_id":"{transaction_id}",'
+    '"name":{name},'
+    '"active_images":{active_images},'
+    '"inactive_images":{inactive_images},'
+    '"failed_images":{failed_images},'
+    '"target_quota":1000,'
+    '"total_recos":0,'
+    '"current_month_recos":0,'
+    '"previous_month_recos":0,'
+    '"processing_images":{processing_images},'
+    '"reco_threshold":1000,'
+    '"request_quota":100000,'
+    # We have ``self.request_count`` but Vuforia always shows 0.
+    # This was not always the case.
+    '"request_usage":0}}'
+)
 
-@wrapt.decorator
-def update_request_count(
-    wrapped: Callable[..., str],
-    instance: Any,
-    args: Tuple[_RequestObjectProxy, _Context],
-    kwargs: Dict,
-) -> str:
+# The update target response gives the result code before the transaction ID,
+# unlike the responses given by ``transaction_result_body``.
+# This gives the same output as ``json_dump``.
+_UPDATE_TARGET_SUCCESS_TEMPLATE = (
+    f'{{{{"result_code":"{ResultCodes.SUCCESS.value}",'
+    '"transaction_id":"{transaction_id}"}}'
+)
+
+
+def run_validators(wrapped: Callable[..., str]) -> Callable[..., str]:
     """
-    Add to the request count.
+    Add to the request count and send a relevant response if any validator
+    raises an exception.
 
     Args:
         wrapped: An endpoint function for `requests_mock`.
-        instance: The class that the endpoint function is in.
-        args: The arguments given to the endpoint function.
-        kwargs: The keyword arguments given to the endpoint function.
 
     Returns:
-        The result of calling the endpoint.
+        The endpoint function, wrapped so that validators are run first.
     """
-    instance.request_count += 1
-    return wrapped(*args, **kwargs)
 
+    @functools.wraps(wrapped)
+    def wrapper(
+        instance: Any,
+        request: _RequestObjectProxy,
+        context: _Context,
+    ) -> str:
+        """
+        Run all validators, then call the endpoint if none of them fail.
 
-@wrapt.decorator
-def run_validators(
-    wrapped: Callable[..., str],
-    instance: Any,
-    args: Tuple[_RequestObjectProxy, _Context],
-    kwargs: Dict,
-) -> str:
-    """
-    Send a relevant response if any validator raises an exception.
+        Args:
+            instance: The class that the endpoint function is in.
+            request: The request to the endpoint.
+            context: The context of the response.
 
-    Args:
-        wrapped: An endpoint function for `requests_mock`.
-        instance: The class that the endpoint function is in.
-        args: The arguments given to the endpoint function.
-        kwargs: The keyword arguments given to the endpoint function.
+        Returns:
+            The result of calling the endpoint, or an error response.
+        """
+        instance.request_count += 1
+        try:
+            run_services_validators(
+                request_headers=request.headers,
+                request_body=request.body,
+                request_method=request.method,
+                request_path=request.path,
+                databases=instance.databases,
+            )
+        except ValidatorException as exc:
+            exc.set_response_headers(headers=context.headers)
+            context.status_code = exc.status_code
+            return exc.response_text
 
-    Returns:
-        The result of calling the endpoint.
-    """
-    request, context = args
-    try:
-        run_services_validators(
-            request_headers=request.headers,
-            request_body=request.body,
-            request_method=request.method,
-            request_path=request.path,
-            databases=instance.databases,
-        )
-    except (
-        UnknownTarget,
-        ProjectInactive,
-        AuthenticationFailure,
-        Fail,
-        MetadataTooLarge,
-        TargetNameExist,
-        BadImage,
-        ImageTooLarge,
-        RequestTimeTooSkewed,
-    ) as exc:
-        context.status_code = exc.status_code
-        return exc.response_text
-    except OopsErrorOccurredResponse as exc:
-        content_type = 'text/html; charset=UTF-8'
-        context.headers['Content-Type'] = content_type
-        context.status_code = exc.status_code
-        return exc.response_text
-    except ContentLengthHeaderTooLarge as exc:
-        context.headers = {'Connection': 'keep-alive'}
-        context.status_code = exc.status_code
-        return exc.response_text
-    except ContentLengthHeaderNotInt as exc:
-        context.headers = {'Connection': 'Close'}
-        context.status_code = exc.status_code
-        return exc.response_text
-    except UnnecessaryRequestBody as exc:
-        context.headers.pop('Content-Type')
-        context.status_code = exc.status_code
-        return exc.response_text
-    return wrapped(*args, **kwargs)
-
-
-ROUTES = set([])
+        return wrapped(instance, request, context)
+
+    return wrapper
+
+
+ROUTES: Set[Route] = set()
 
 
 def route(
@@ -172,16 +150,11 @@ def route(
 
         decorators = [
             run_validators,
-            set_date_header,
-            set_content_length_header,
-            update_request_count,
+            set_response_headers,
         ]
 
         for decorator in decorators:
-            # See https://github.com/PyCQA/pylint/issues/259
-            method = decorator(  # pylint: disable=no-value-for-parameter
-                method,
-            )
+            method = decorator(method)
 
         return method
 
@@ -196,19 +169,27 @@ def _get_target_from_request(
     Given a request path with a target ID in the path, and a list of databases,
     return the target with that ID from those databases.
     """
-    split_path = request_path.split('/')
-    target_id = split_path[-1]
-    all_database_targets = itertools.chain.from_iterable(
-        [database.targets for database in databases],
-    )
-    [target] = [
-        target
-        for target in all_database_targets
-        if target.target_id == target_id
+    target_id = request_path.rpartition('/')[2]
+    database_targets = [
+        database.get_target(target_id=target_id) for database in databases
     ]
+    [target] = [target for target in database_targets if target is not None]
     return target
 
 
+def _fail(
+    context: _Context,
+    status_code: HTTPStatus,
+    result_code: ResultCodes,
+) -> str:
+    """
+    Set the status code of an error response and return its body, which gives
+    only a transaction ID and the given result code.
+    """
+    context.status_code = status_code
+    return transaction_result_body(result_code=result_code)
+
+
 class MockVuforiaWebServicesAPI:
     """
     A fake implementation of the Vuforia Web Services API.
@@ -231,7 +212,7 @@ class MockVuforiaWebServicesAPI:
             routes: The `Route`s to be used in the mock.
             request_count: The number of requests made to this API.
         """
-        self.databases: Set[VuforiaDatabase] = set([])
+        self.databases: Set[VuforiaDatabase] = set()
         self.routes: Set[Route] = ROUTES
         self._processing_time_seconds = processing_time_seconds
         self.request_count = 0
@@ -251,7 +232,8 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Add-a-Target
         """
-        name = request.json()['name']
+        request_json = parse_json(request_body=request.body)
+        name = request_json['name']
         database = get_database_matching_server_keys(
             request_headers=request.headers,
             request_body=request.body,
@@ -262,38 +244,37 @@ class MockVuforiaWebServicesAPI:
 
         assert isinstance(database, VuforiaDatabase)
 
-        targets = (
-            target for target in database.targets if not target.delete_date
-        )
-        if any(target.name == name for target in targets):
-            context.status_code = HTTPStatus.FORBIDDEN
-            body = {
-                'transaction_id': uuid.uuid4().hex,
-                'result_code': ResultCodes.TARGET_NAME_EXIST.value,
-            }
-            return json_dump(body)
-
-        active_flag = request.json().get('active_flag')
+        if any(
+            target.name == name and not target.delete_date
+            for target in database.targets
+        ):
+            return _fail(
+                context=context,
+                status_code=HTTPStatus.FORBIDDEN,
+                result_code=ResultCodes.TARGET_NAME_EXIST,
+            )
+
+        active_flag = request_json.get('active_flag')
         if active_flag is None:
             active_flag = True
 
-        image = request.json()['image']
-        decoded = base64.b64decode(image)
+        image = request_json['image']
+        decoded = decode_base64(encoded_data=image)
         image_file = io.BytesIO(decoded)
 
         new_target = Target(
-            name=request.json()['name'],
-            width=request.json()['width'],
+            name=name,
+            width=request_json['width'],
             image=image_file,
             active_flag=active_flag,
             processing_time_seconds=self._processing_time_seconds,
-            application_metadata=request.json().get('application_metadata'),
+            application_metadata=request_json.get('application_metadata'),
         )
-        database.targets.add(new_target)
+        database.add_target(target=new_target)
 
         context.status_code = HTTPStatus.CREATED
         body = {
-            'transaction_id': uuid.uuid4().hex,
+            'transaction_id': secrets.token_hex(16),
             'result_code': ResultCodes.TARGET_CREATED.value,
             'target_id': new_target.target_id,
         }
@@ -314,27 +295,21 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Delete-a-Target
         """
-        body: Dict[str, str] = {}
         target = _get_target_from_request(
             request_path=request.path,
             databases=self.databases,
         )
 
         if target.status == TargetStatuses.PROCESSING.value:
-            context.status_code = HTTPStatus.FORBIDDEN
-            body = {
-                'transaction_id': uuid.uuid4().hex,
-                'result_code': ResultCodes.TARGET_STATUS_PROCESSING.value,
-            }
-            return json_dump(body)
+            return _fail(
+                context=context,
+                status_code=HTTPStatus.FORBIDDEN,
+                result_code=ResultCodes.TARGET_STATUS_PROCESSING,
+            )
 
         target.delete()
 
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.SUCCESS.value,
-        }
-        return json_dump(body)
+        return transaction_result_body(result_code=ResultCodes.SUCCESS)
 
     @route(path_pattern='/summary', http_methods={GET})
     def database_summary(
@@ -348,8 +323,6 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Get-a-Database-Summary-Report
         """
-        body: Dict[str, Union[str, int]] = {}
-
         database = get_database_matching_server_keys(
             request_headers=request.headers,
             request_body=request.body,
@@ -359,64 +332,37 @@ class MockVuforiaWebServicesAPI:
         )
 
         assert isinstance(database, VuforiaDatabase)
-        active_images = len(
-            [
-                target
-                for target in database.targets
-                if target.status == TargetStatuses.SUCCESS.value
-                and target.active_flag
-                and not target.delete_date
-            ],
+        active_images = 0
+        inactive_images = 0
+        failed_images = 0
+        processing_images = 0
+        for target in database.targets:
+            if target.delete_date:
+                continue
+
+            # Getting the status of a target can mean reading its image, so
+            # this is done once per target.
+            target_status = target.status
+            if target_status == TargetStatuses.SUCCESS.value:
+                if target.active_flag:
+                    active_images += 1
+                else:
+                    inactive_images += 1
+            elif target_status == TargetStatuses.FAILED.value:
+                failed_images += 1
+            elif target_status == TargetStatuses.PROCESSING.value:
+                processing_images += 1
+
+        return _DATABASE_SUMMARY_TEMPLATE.format(
+            result_code=ResultCodes.SUCCESS.value,
+            transaction_id=secrets.token_hex(16),
+            name=json_dump(database.database_name),
+            active_images=active_images,
+            inactive_images=inactive_images,
+            failed_images=failed_images,
+            processing_images=processing_images,
         )
 
-        failed_images = len(
-            [
-                target
-                for target in database.targets
-                if target.status == TargetStatuses.FAILED.value
-                and not target.delete_date
-            ],
-        )
-
-        inactive_images = len(
-            [
-                target
-                for target in database.targets
-                if target.status == TargetStatuses.SUCCESS.value
-                and not target.active_flag
-                and not target.delete_date
-            ],
-        )
-
-        processing_images = len(
-            [
-                target
-                for target in database.targets
-                if target.status == TargetStatuses.PROCESSING.value
-                and not target.delete_date
-            ],
-        )
-
-        body = {
-            'result_code': ResultCodes.SUCCESS.value,
-            'transaction_id': uuid.uuid4().hex,
-            'name': database.database_name,
-            'active_images': active_images,
-            'inactive_images': inactive_images,
-            'failed_images': failed_images,
-            'target_quota': 1000,
-            'total_recos': 0,
-            'current_month_recos': 0,
-            'previous_month_recos': 0,
-            'processing_images': processing_images,
-            'reco_threshold': 1000,
-            'request_quota': 100000,
-            # We have ``self.request_count`` but Vuforia always shows 0.
-            # This was not always the case.
-            'request_usage': 0,
-        }
-        return json_dump(body)
-
     @route(path_pattern='/targets', http_methods={GET})
     def target_list(
         self,
@@ -445,7 +391,7 @@ class MockVuforiaWebServicesAPI:
         ]
 
         body: Dict[str, Union[str, List[str]]] = {
-            'transaction_id': uuid.uuid4().hex,
+            'transaction_id': secrets.token_hex(16),
             'result_code': ResultCodes.SUCCESS.value,
             'results': results,
         }
@@ -479,7 +425,7 @@ class MockVuforiaWebServicesAPI:
 
         body = {
             'result_code': ResultCodes.SUCCESS.value,
-            'transaction_id': uuid.uuid4().hex,
+            'transaction_id': secrets.token_hex(16),
             'target_record': target_record,
             'status': target.status,
         }
@@ -500,10 +446,6 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Check-for-Duplicate-Targets
         """
-        target = _get_target_from_request(
-            request_path=request.path,
-            databases=self.databases,
-        )
         database = get_database_matching_server_keys(
             request_headers=request.headers,
             request_body=request.body,
@@ -513,12 +455,15 @@ class MockVuforiaWebServicesAPI:
         )
 
         assert isinstance(database, VuforiaDatabase)
-        other_targets = set(database.targets) - set([target])
-
+        target = _get_target_from_request(
+            request_path=request.path,
+            databases={database},
+        )
         similar_targets: List[str] = [
             other.target_id
-            for other in other_targets
-            if Image.open(other.image) == Image.open(target.image)
+            for other in database.targets
+            if other is not target
+            and other.image_digest == target.image_digest
             and TargetStatuses.FAILED.value
             not in (target.status, other.status)
             and TargetStatuses.PROCESSING.value != other.status
@@ -526,7 +471,7 @@ class MockVuforiaWebServicesAPI:
         ]
 
         body = {
-            'transaction_id': uuid.uuid4().hex,
+            'transaction_id': secrets.token_hex(16),
             'result_code': ResultCodes.SUCCESS.value,
             'similar_targets': similar_targets,
         }
@@ -548,11 +493,6 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Update-a-Target
         """
-        target = _get_target_from_request(
-            request_path=request.path,
-            databases=self.databases,
-        )
-        body: Dict[str, str] = {}
         database = get_database_matching_server_keys(
             request_headers=request.headers,
             request_body=request.body,
@@ -562,77 +502,81 @@ class MockVuforiaWebServicesAPI:
         )
 
         assert isinstance(database, VuforiaDatabase)
+        target = _get_target_from_request(
+            request_path=request.path,
+            databases={database},
+        )
 
         if target.status != TargetStatuses.SUCCESS.value:
-            context.status_code = HTTPStatus.FORBIDDEN
-            body = {
-                'transaction_id': uuid.uuid4().hex,
-                'result_code': ResultCodes.TARGET_STATUS_NOT_SUCCESS.value,
-            }
-            return json_dump(body)
-
-        if 'width' in request.json():
-            target.width = request.json()['width']
-
-        if 'active_flag' in request.json():
-            active_flag = request.json()['active_flag']
+            return _fail(
+                context=context,
+                status_code=HTTPStatus.FORBIDDEN,
+                result_code=ResultCodes.TARGET_STATUS_NOT_SUCCESS,
+            )
+
+        request_json = parse_json(request_body=request.body)
+        if 'width' in request_json:
+            target.width = request_json['width']
+
+        if 'active_flag' in request_json:
+            active_flag = request_json['active_flag']
             if active_flag is None:
-                body = {
-                    'transaction_id': uuid.uuid4().hex,
-                    'result_code': ResultCodes.FAIL.value,
-                }
-                context.status_code = HTTPStatus.BAD_REQUEST
-                return json_dump(body)
+                return _fail(
+                    context=context,
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    result_code=ResultCodes.FAIL,
+                )
             target.active_flag = active_flag
 
-        if 'application_metadata' in request.json():
-            if request.json()['application_metadata'] is None:
-                body = {
-                    'transaction_id': uuid.uuid4().hex,
-                    'result_code': ResultCodes.FAIL.value,
-                }
-                context.status_code = HTTPStatus.BAD_REQUEST
-                return json_dump(body)
-            application_metadata = request.json()['application_metadata']
+        if 'application_metadata' in request_json:
+            if request_json['application_metadata'] is None:
+                return _fail(
+                    context=context,
+                    status_code=HTTPStatus.BAD_REQUEST,
+                    result_code=ResultCodes.FAIL,
+                )
+            application_metadata = request_json['application_metadata']
             target.application_metadata = application_metadata
 
-        if 'name' in request.json():
-            name = request.json()['name']
-            other_targets = set(database.targets) - set([target])
+        if 'name' in request_json:
+            name = request_json['name']
             if any(
                 other.name == name
-                for other in other_targets
-                if not other.delete_date
+                for other in database.targets
+                if other is not target and not other.delete_date
             ):
-                context.status_code = HTTPStatus.FORBIDDEN
-                body = {
-                    'transaction_id': uuid.uuid4().hex,
-                    'result_code': ResultCodes.TARGET_NAME_EXIST.value,
-                }
-                return json_dump(body)
+                return _fail(
+                    context=context,
+                    status_code=HTTPStatus.FORBIDDEN,
+                    result_code=ResultCodes.TARGET_NAME_EXIST,
+                )
             target.name = name
 
-        if 'image' in request.json():
-            image = request.json()['image']
-            decoded = base64.b64decode(image)
+        if 'image' in request_json:
+            image = request_json['image']
+            decoded = decode_base64(encoded_data=image)
             image_file = io.BytesIO(decoded)
             target.image = image_file
 
         # In the real implementation, the tracking rating can stay the same.
         # However, for demonstration purposes, the tracking rating changes but
         # when the target is updated.
-        available_values = list(set(range(6)) - set([target.tracking_rating]))
-        target.processed_tracking_rating = random.choice(available_values)
-
-        gmt = ZoneInfo('GMT')
-        now = datetime.datetime.now(tz=gmt)
+        #
+        # The target has finished processing, so the current rating is between
+        # 0 and 5.
+        # Pick one of the other five ratings.
+        tracking_rating = target.tracking_rating
+        new_tracking_rating = random.randrange(5)
+        if new_tracking_rating >= tracking_rating:
+            new_tracking_rating += 1
+        target.processed_tracking_rating = new_tracking_rating
+
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         target.last_modified_date = now
 
-        body = {
-            'result_code': ResultCodes.SUCCESS.value,
-            'transaction_id': uuid.uuid4().hex,
-        }
-        return json_dump(body)
+        return _UPDATE_TARGET_SUCCESS_TEMPLATE.format(
+            transaction_id=secrets.token_hex(16),
+        )
 
     @route(path_pattern=f'/summary/{_TARGET_ID_PATTERN}', http_methods={GET})
     def target_summary(
@@ -646,10 +590,6 @@ class MockVuforiaWebServicesAPI:
         Fake implementation of
         https://library.vuforia.com/articles/Solution/How-To-Use-the-Vuforia-Web-Services-API.html#How-To-Retrieve-a-Target-Summary-Report
         """
-        target = _get_target_from_request(
-            request_path=request.path,
-            databases=self.databases,
-        )
         database = get_database_matching_server_keys(
             request_headers=request.headers,
             request_body=request.body,
@@ -659,9 +599,13 @@ class MockVuforiaWebServicesAPI:
         )
 
         assert isinstance(database, VuforiaDatabase)
+        target = _get_target_from_request(
+            request_path=request.path,
+            databases={database},
+        )
         body = {
             'status': target.status,
-            'transaction_id': uuid.uuid4().hex,
+            'transaction_id': secrets.token_hex(16),
             'result_code': ResultCodes.SUCCESS.value,
             'database_name': database.database_name,
             'target_name': target.name,
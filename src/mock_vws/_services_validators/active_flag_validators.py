@@ -2,9 +2,9 @@
 Validators for the active flag.
 """
 
-import json
 from http import HTTPStatus
 
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import Fail
 
 
@@ -23,11 +23,11 @@ def validate_active_flag(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'active_flag' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'active_flag' not in request_json:
         return
 
-    active_flag = json.loads(request_text).get('active_flag')
+    active_flag = request_json['active_flag']
 
     if active_flag is None or isinstance(active_flag, bool):
         return
@@ -6,6 +6,7 @@ from http import HTTPStatus
 from typing import Dict, Set
 
 from mock_vws._database_matchers import get_database_matching_server_keys
+from mock_vws._mock_common import parse_authorization_header
 from mock_vws._services_validators.exceptions import (
     AuthenticationFailure,
     Fail,
@@ -41,9 +42,9 @@ def validate_access_key_exists(
     Raises:
         Fail: The access key does not match a given database.
     """
-    header = request_headers['Authorization']
-    first_part, _ = header.split(':')
-    _, access_key = first_part.split(' ')
+    access_key, _ = parse_authorization_header(
+        authorization_header=request_headers['Authorization'],
+    )
     for database in databases:
         if access_key == database.server_access_key:
             return
@@ -64,7 +65,11 @@ def validate_auth_header_has_signature(
         Fail: The "Authorization" header does not include a signature.
     """
     header = request_headers['Authorization']
-    if header.count(':') == 1 and header.split(':')[1]:
+    colon_index = header.find(':')
+    if (
+        colon_index not in (-1, len(header) - 1)
+        and header.find(':', colon_index + 1) == -1
+    ):
         return
 
     raise Fail(status_code=HTTPStatus.BAD_REQUEST)
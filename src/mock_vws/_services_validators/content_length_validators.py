@@ -26,7 +26,7 @@ def validate_content_length_header_is_int(
         ContentLengthHeaderNotInt: The content length header is not an
             integer
     """
-    body_length = len(request_body if request_body else b'')
+    body_length = len(request_body) if request_body else 0
     given_content_length = request_headers.get('Content-Length', body_length)
 
     try:
@@ -50,7 +50,7 @@ def validate_content_length_header_not_too_large(
         ContentLengthHeaderTooLarge: The given content length header says
             that the content length is greater than the body length.
     """
-    body_length = len(request_body if request_body else b'')
+    body_length = len(request_body) if request_body else 0
     given_content_length = request_headers.get('Content-Length', body_length)
     given_content_length_value = int(given_content_length)
     if given_content_length_value > body_length:
@@ -72,7 +72,7 @@ def validate_content_length_header_not_too_small(
         AuthenticationFailure: The given content length header says that
             the content length is smaller than the body length.
     """
-    body_length = len(request_body if request_body else b'')
+    body_length = len(request_body) if request_body else 0
     given_content_length = request_headers.get('Content-Length', body_length)
     given_content_length_value = int(given_content_length)
 
@@ -3,13 +3,15 @@ Validators of the date header to use in the mock services API.
 """
 
 import datetime
+import functools
+import time
 from http import HTTPStatus
 from typing import Dict
 
-from backports.zoneinfo import ZoneInfo
-
 from mock_vws._services_validators.exceptions import Fail, RequestTimeTooSkewed
 
+_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S GMT'
+
 
 def validate_date_header_given(request_headers: Dict[str, str]) -> None:
     """
@@ -28,6 +30,26 @@ def validate_date_header_given(request_headers: Dict[str, str]) -> None:
     raise Fail(status_code=HTTPStatus.BAD_REQUEST)
 
 
+@functools.lru_cache(maxsize=64)
+def _parse_date_header(date_header: str) -> datetime.datetime:
+    """
+    Parse a ``Date`` header.
+
+    The same header is parsed by two validators for each request, so results
+    are cached.
+
+    Args:
+        date_header: The ``Date`` header sent with a request.
+
+    Returns:
+        The date given in the header.
+
+    Raises:
+        ValueError: The header is not in the accepted format.
+    """
+    return datetime.datetime.strptime(date_header, _DATE_FORMAT)
+
+
 def validate_date_format(request_headers: Dict[str, str]) -> None:
     """
     Validate the format of the date header given to a VWS endpoint.
@@ -39,10 +61,8 @@ def validate_date_format(request_headers: Dict[str, str]) -> None:
         Fail: The date is in the wrong format.
     """
 
-    date_header = request_headers['Date']
-    date_format = '%a, %d %b %Y %H:%M:%S GMT'
     try:
-        datetime.datetime.strptime(date_header, date_format)
+        _parse_date_header(date_header=request_headers['Date'])
     except ValueError as exc:
         raise Fail(status_code=HTTPStatus.BAD_REQUEST) from exc
 
@@ -58,17 +78,14 @@ def validate_date_in_range(request_headers: Dict[str, str]) -> None:
         RequestTimeTooSkewed: The date is out of range.
     """
 
-    date_from_header = datetime.datetime.strptime(
-        request_headers['Date'],
-        '%a, %d %b %Y %H:%M:%S GMT',
+    date_from_header = _parse_date_header(
+        date_header=request_headers['Date'],
     )
 
-    gmt = ZoneInfo('GMT')
-    now = datetime.datetime.now(tz=gmt)
-    date_from_header = date_from_header.replace(tzinfo=gmt)
-    time_difference = now - date_from_header
+    date_from_header = date_from_header.replace(tzinfo=datetime.timezone.utc)
+    time_difference = time.time() - date_from_header.timestamp()
 
-    maximum_time_difference = datetime.timedelta(minutes=5)
+    maximum_time_difference_seconds = 5 * 60
 
-    if abs(time_difference) >= maximum_time_difference:
+    if abs(time_difference) >= maximum_time_difference_seconds:
         raise RequestTimeTooSkewed
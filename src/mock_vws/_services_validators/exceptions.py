@@ -2,15 +2,46 @@
 Exceptions to raise from validators.
 """
 
-import uuid
 from http import HTTPStatus
 from pathlib import Path
+from typing import Dict
 
 from mock_vws._constants import ResultCodes
-from mock_vws._mock_common import json_dump
+from mock_vws._mock_common import transaction_result_body
 
+_OOPS_ERROR_OCCURRED_RESPONSE_TEXT = (
+    Path(__file__).parent.parent
+    / 'resources'
+    / 'oops_error_occurred_response.html'
+).read_text(encoding='utf-8')
 
-class UnknownTarget(Exception):
+
+class ValidatorException(Exception):
+    """
+    A base class for exceptions thrown from mock Vuforia services endpoint
+    validators.
+
+    Attributes:
+        status_code: The status code to use in a response if this is raised.
+        response_text: The response text to use in a response if this is
+            raised.
+    """
+
+    status_code: int
+    response_text: str
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        By default, the headers are not changed.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+
+
+class UnknownTarget(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'UnknownTarget'.
@@ -26,14 +57,12 @@ class UnknownTarget(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.NOT_FOUND
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.UNKNOWN_TARGET.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.UNKNOWN_TARGET
+        )
 
 
-class ProjectInactive(Exception):
+class ProjectInactive(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'ProjectInactive'.
@@ -49,14 +78,12 @@ class ProjectInactive(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.FORBIDDEN
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.PROJECT_INACTIVE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.PROJECT_INACTIVE
+        )
 
 
-class AuthenticationFailure(Exception):
+class AuthenticationFailure(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'AuthenticationFailure'.
@@ -72,14 +99,12 @@ class AuthenticationFailure(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNAUTHORIZED
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.AUTHENTICATION_FAILURE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.AUTHENTICATION_FAILURE
+        )
 
 
-class Fail(Exception):
+class Fail(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code 'Fail'.
     """
@@ -94,14 +119,12 @@ class Fail(Exception):
         """
         super().__init__()
         self.status_code = status_code
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.FAIL.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.FAIL
+        )
 
 
-class MetadataTooLarge(Exception):
+class MetadataTooLarge(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'MetadataTooLarge'.
@@ -117,14 +140,12 @@ class MetadataTooLarge(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.METADATA_TOO_LARGE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.METADATA_TOO_LARGE
+        )
 
 
-class TargetNameExist(Exception):
+class TargetNameExist(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'TargetNameExist'.
@@ -140,14 +161,12 @@ class TargetNameExist(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.FORBIDDEN
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.TARGET_NAME_EXIST.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.TARGET_NAME_EXIST
+        )
 
 
-class OopsErrorOccurredResponse(Exception):
+class OopsErrorOccurredResponse(ValidatorException):
     """
     Exception raised when VWS returns an HTML page which says "Oops, an error
     occurred".
@@ -165,14 +184,19 @@ class OopsErrorOccurredResponse(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-        resources_dir = Path(__file__).parent.parent / 'resources'
-        filename = 'oops_error_occurred_response.html'
-        oops_resp_file = resources_dir / filename
-        text = str(oops_resp_file.read_text())
-        self.response_text = text
+        self.response_text = _OOPS_ERROR_OCCURRED_RESPONSE_TEXT
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers['Content-Type'] = 'text/html; charset=UTF-8'
 
 
-class BadImage(Exception):
+class BadImage(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'BadImage'.
@@ -188,14 +212,12 @@ class BadImage(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.BAD_IMAGE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.BAD_IMAGE
+        )
 
 
-class ImageTooLarge(Exception):
+class ImageTooLarge(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'ImageTooLarge'.
@@ -211,14 +233,12 @@ class ImageTooLarge(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.UNPROCESSABLE_ENTITY
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.IMAGE_TOO_LARGE.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.IMAGE_TOO_LARGE
+        )
 
 
-class RequestTimeTooSkewed(Exception):
+class RequestTimeTooSkewed(ValidatorException):
     """
     Exception raised when Vuforia returns a response with a result code
     'RequestTimeTooSkewed'.
@@ -234,14 +254,12 @@ class RequestTimeTooSkewed(Exception):
         """
         super().__init__()
         self.status_code = HTTPStatus.FORBIDDEN
-        body = {
-            'transaction_id': uuid.uuid4().hex,
-            'result_code': ResultCodes.REQUEST_TIME_TOO_SKEWED.value,
-        }
-        self.response_text = json_dump(body)
+        self.response_text = transaction_result_body(
+            result_code=ResultCodes.REQUEST_TIME_TOO_SKEWED
+        )
 
 
-class ContentLengthHeaderTooLarge(Exception):
+class ContentLengthHeaderTooLarge(ValidatorException):
     """
     Exception raised when the given content length header is too large.
     """
@@ -258,8 +276,18 @@ class ContentLengthHeaderTooLarge(Exception):
         self.status_code = HTTPStatus.GATEWAY_TIMEOUT
         self.response_text = ''
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
 
-class ContentLengthHeaderNotInt(Exception):
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.clear()
+        headers['Connection'] = 'keep-alive'
+
+
+class ContentLengthHeaderNotInt(ValidatorException):
     """
     Exception raised when the given content length header is not an integer.
     """
@@ -276,8 +304,18 @@ class ContentLengthHeaderNotInt(Exception):
         self.status_code = HTTPStatus.BAD_REQUEST
         self.response_text = ''
 
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.clear()
+        headers['Connection'] = 'Close'
+
 
-class UnnecessaryRequestBody(Exception):
+class UnnecessaryRequestBody(ValidatorException):
     """
     Exception raised when a request body is given but not necessary.
     """
@@ -293,3 +331,12 @@ class UnnecessaryRequestBody(Exception):
         super().__init__()
         self.status_code = HTTPStatus.BAD_REQUEST
         self.response_text = ''
+
+    def set_response_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Change the headers of the response to give if this is raised.
+
+        Args:
+            headers: The headers of the response, which are changed in place.
+        """
+        headers.pop('Content-Type')
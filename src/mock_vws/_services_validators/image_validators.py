@@ -3,13 +3,15 @@ Image validators to use in the mock.
 """
 
 import binascii
+import functools
 import io
-import json
 from http import HTTPStatus
+from typing import Optional, Tuple
 
 from PIL import Image
 
 from mock_vws._base64_decoding import decode_base64
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import (
     BadImage,
     Fail,
@@ -17,6 +19,30 @@ from mock_vws._services_validators.exceptions import (
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _image_format_and_mode(image: str) -> Tuple[Optional[str], str]:
+    """
+    Get the format and color mode of the image given to a VWS endpoint.
+
+    The same image is checked by several validators, so the result for the
+    most recently given image is cached.
+    Only the header of the image is read, not the pixel data, and the image
+    is closed rather than kept by the cache.
+
+    Args:
+        image: The base64 encoded image data.
+
+    Returns:
+        The format and the color mode of the image.
+
+    Raises:
+        OSError: The image data is not an image file.
+    """
+    decoded = decode_base64(encoded_data=image)
+    with Image.open(io.BytesIO(decoded)) as pil_image:
+        return pil_image.format, pil_image.mode
+
+
 def validate_image_format(request_body: bytes) -> None:
     """
     Validate the format of the image given to a VWS endpoint.
@@ -30,17 +56,15 @@ def validate_image_format(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    image = json.loads(request_text).get('image')
+    request_json = parse_json(request_body=request_body)
+    image = request_json.get('image')
 
     if image is None:
         return
 
-    decoded = decode_base64(encoded_data=image)
-    image_file = io.BytesIO(decoded)
-    pil_image = Image.open(image_file)
+    image_format, _ = _image_format_and_mode(image=image)
 
-    if pil_image.format in ('PNG', 'JPEG'):
+    if image_format in ('PNG', 'JPEG'):
         return
 
     raise BadImage
@@ -61,17 +85,15 @@ def validate_image_color_space(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    image = json.loads(request_text).get('image')
+    request_json = parse_json(request_body=request_body)
+    image = request_json.get('image')
 
     if image is None:
         return
 
-    decoded = decode_base64(encoded_data=image)
-    image_file = io.BytesIO(decoded)
-    pil_image = Image.open(image_file)
+    _, image_mode = _image_format_and_mode(image=image)
 
-    if pil_image.mode in ('L', 'RGB'):
+    if image_mode in ('L', 'RGB'):
         return
 
     raise BadImage
@@ -92,8 +114,8 @@ def validate_image_size(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    image = json.loads(request_text).get('image')
+    request_json = parse_json(request_body=request_body)
+    image = request_json.get('image')
 
     if image is None:
         return
@@ -120,17 +142,14 @@ def validate_image_is_image(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    image = json.loads(request_text).get('image')
+    request_json = parse_json(request_body=request_body)
+    image = request_json.get('image')
 
     if image is None:
         return
 
-    decoded = decode_base64(encoded_data=image)
-    image_file = io.BytesIO(decoded)
-
     try:
-        Image.open(image_file)
+        _image_format_and_mode(image=image)
     except OSError as exc:
         raise BadImage from exc
 
@@ -149,11 +168,11 @@ def validate_image_encoding(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'image' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'image' not in request_json:
         return
 
-    image = json.loads(request_text).get('image')
+    image = request_json.get('image')
 
     try:
         decode_base64(encoded_data=image)
@@ -175,11 +194,11 @@ def validate_image_data_type(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'image' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'image' not in request_json:
         return
 
-    image = json.loads(request_text).get('image')
+    image = request_json.get('image')
 
     if isinstance(image, str):
         return
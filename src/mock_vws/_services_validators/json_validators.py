@@ -2,12 +2,12 @@
 Validators for given JSON.
 """
 
-import json
 from http import HTTPStatus
 from json.decoder import JSONDecodeError
 
 from requests_mock import POST, PUT
 
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import (
     Fail,
     UnnecessaryRequestBody,
@@ -38,6 +38,6 @@ def validate_json(
         raise UnnecessaryRequestBody
 
     try:
-        json.loads(request_body.decode())
+        parse_json(request_body=request_body)
     except JSONDecodeError as exc:
         raise Fail(status_code=HTTPStatus.BAD_REQUEST) from exc
@@ -2,14 +2,15 @@
 Validators for JSON keys.
 """
 
-import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from http import HTTPStatus
-from typing import Set
+from typing import FrozenSet, Pattern
 
 from requests_mock import DELETE, GET, POST, PUT
 
+from mock_vws._mock_common import parse_json
+
 from .exceptions import Fail
 
 
@@ -25,12 +26,99 @@ class _Route:
         mandatory_keys: Keys required by the endpoint.
         optional_keys: Keys which are not required by the endpoint but which
             are allowed.
+
+    Attributes:
+        allowed_keys: Keys which are allowed by the endpoint.
+        path_regex: A compiled regular expression which matches the whole
+            path of a request to the endpoint.
     """
 
     path_pattern: str
-    http_methods: Set[str]
-    mandatory_keys: Set[str]
-    optional_keys: Set[str]
+    http_methods: FrozenSet[str]
+    mandatory_keys: FrozenSet[str]
+    optional_keys: FrozenSet[str]
+    allowed_keys: FrozenSet[str] = field(init=False)
+    path_regex: Pattern[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        """
+        Set the keys which are allowed by the endpoint, and compile the path
+        pattern.
+        """
+        self.allowed_keys = self.mandatory_keys | self.optional_keys
+        self.path_regex = re.compile(self.path_pattern + '$')
+
+
+_TARGET_ID_PATTERN = '[A-Za-z0-9]+'
+
+# The keys allowed by each route and the path patterns do not change, so the
+# routes are built once.
+_ROUTES = (
+    # Add target.
+    _Route(
+        path_pattern='/targets',
+        http_methods=frozenset({POST}),
+        mandatory_keys=frozenset({'image', 'width', 'name'}),
+        optional_keys=frozenset({'active_flag', 'application_metadata'}),
+    ),
+    # Delete target.
+    _Route(
+        path_pattern=f'/targets/{_TARGET_ID_PATTERN}',
+        http_methods=frozenset({DELETE}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+    # Database summary.
+    _Route(
+        path_pattern='/summary',
+        http_methods=frozenset({GET}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+    # Target list.
+    _Route(
+        path_pattern='/targets',
+        http_methods=frozenset({GET}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+    # Get target.
+    _Route(
+        path_pattern=f'/targets/{_TARGET_ID_PATTERN}',
+        http_methods=frozenset({GET}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+    # Get duplicates.
+    _Route(
+        path_pattern=f'/duplicates/{_TARGET_ID_PATTERN}',
+        http_methods=frozenset({GET}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+    # Update target.
+    _Route(
+        path_pattern=f'/targets/{_TARGET_ID_PATTERN}',
+        http_methods=frozenset({PUT}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(
+            {
+                'active_flag',
+                'application_metadata',
+                'image',
+                'name',
+                'width',
+            },
+        ),
+    ),
+    # Target summary.
+    _Route(
+        path_pattern=f'/summary/{_TARGET_ID_PATTERN}',
+        http_methods=frozenset({GET}),
+        mandatory_keys=frozenset(),
+        optional_keys=frozenset(),
+    ),
+)
 
 
 def validate_keys(
@@ -50,106 +138,23 @@ def validate_keys(
         Fail: Any given keys are not allowed, or if any required keys are
             missing.
     """
-    target_id_pattern = '[A-Za-z0-9]+'
-    add_target = _Route(
-        path_pattern='/targets',
-        http_methods={POST},
-        mandatory_keys={'image', 'width', 'name'},
-        optional_keys={'active_flag', 'application_metadata'},
-    )
-
-    delete_target = _Route(
-        path_pattern=f'/targets/{target_id_pattern}',
-        http_methods={DELETE},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    database_summary = _Route(
-        path_pattern='/summary',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    target_list = _Route(
-        path_pattern='/targets',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    get_target = _Route(
-        path_pattern=f'/targets/{target_id_pattern}',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    target_summary = _Route(
-        path_pattern=f'/summary/{target_id_pattern}',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    get_duplicates = _Route(
-        path_pattern=f'/duplicates/{target_id_pattern}',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    update_target = _Route(
-        path_pattern=f'/targets/{target_id_pattern}',
-        http_methods={PUT},
-        mandatory_keys=set([]),
-        optional_keys={
-            'active_flag',
-            'application_metadata',
-            'image',
-            'name',
-            'width',
-        },
-    )
-
-    target_summary = _Route(
-        path_pattern=f'/summary/{target_id_pattern}',
-        http_methods={GET},
-        mandatory_keys=set([]),
-        optional_keys=set([]),
-    )
-
-    routes = (
-        add_target,
-        delete_target,
-        database_summary,
-        target_list,
-        get_target,
-        get_duplicates,
-        update_target,
-        target_summary,
-    )
-
     [matching_route] = [
         route
-        for route in routes
-        if re.match(re.compile(route.path_pattern + '$'), request_path)
+        for route in _ROUTES
+        if route.path_regex.match(request_path)
         and request_method in route.http_methods
     ]
 
     mandatory_keys = matching_route.mandatory_keys
-    optional_keys = matching_route.optional_keys
-    allowed_keys = mandatory_keys.union(optional_keys)
+    allowed_keys = matching_route.allowed_keys
 
     if request_body is None and not allowed_keys:
         return
 
-    request_text = request_body.decode()
-    request_json = json.loads(request_text)
-    given_keys = set(request_json.keys())
-    all_given_keys_allowed = given_keys.issubset(allowed_keys)
-    all_mandatory_keys_given = mandatory_keys.issubset(given_keys)
+    request_json = parse_json(request_body=request_body)
+    given_keys = request_json.keys()
+    all_given_keys_allowed = given_keys <= allowed_keys
+    all_mandatory_keys_given = mandatory_keys <= given_keys
 
     if all_given_keys_allowed and all_mandatory_keys_given:
         return
@@ -3,10 +3,10 @@ Validators for application metadata.
 """
 
 import binascii
-import json
 from http import HTTPStatus
 
 from mock_vws._base64_decoding import decode_base64
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import Fail, MetadataTooLarge
 
 
@@ -24,8 +24,7 @@ def validate_metadata_size(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    request_json = json.loads(request_text)
+    request_json = parse_json(request_body=request_body)
     application_metadata = request_json.get('application_metadata')
     if application_metadata is None:
         return
@@ -52,8 +51,7 @@ def validate_metadata_encoding(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    request_json = json.loads(request_text)
+    request_json = parse_json(request_body=request_body)
     if 'application_metadata' not in request_json:
         return
 
@@ -81,8 +79,7 @@ def validate_metadata_type(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    request_json = json.loads(request_text)
+    request_json = parse_json(request_body=request_body)
     if 'application_metadata' not in request_json:
         return
 
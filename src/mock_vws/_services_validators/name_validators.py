@@ -2,9 +2,9 @@
 Validators for target names.
 """
 
-import json
 from http import HTTPStatus
 
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import (
     Fail,
     OopsErrorOccurredResponse,
@@ -35,13 +35,15 @@ def validate_name_characters_in_range(
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'name' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'name' not in request_json:
         return
 
-    name = json.loads(request_text)['name']
+    name = request_json['name']
 
-    if all(ord(character) <= 65535 for character in name):
+    # Both checks scan the string in C rather than character by character in
+    # Python. An empty name is ASCII, so ``max`` is never given an empty name.
+    if name.isascii() or max(name) <= '\uffff':
         return
 
     if (request_method, request_path) == ('POST', '/targets'):
@@ -64,11 +66,11 @@ def validate_name_type(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'name' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'name' not in request_json:
         return
 
-    name = json.loads(request_text)['name']
+    name = request_json['name']
 
     if isinstance(name, str):
         return
@@ -90,13 +92,13 @@ def validate_name_length(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'name' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'name' not in request_json:
         return
 
-    name = json.loads(request_text)['name']
+    name = request_json['name']
 
-    if name and len(name) < 65:
+    if 1 <= len(name) <= 64:
         return
 
     raise Fail(status_code=HTTPStatus.BAD_REQUEST)
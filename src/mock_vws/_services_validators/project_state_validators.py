@@ -40,7 +40,7 @@ def validate_project_state(
     )
 
     assert isinstance(database, VuforiaDatabase)
-    if database.state != States.PROJECT_INACTIVE:
+    if database.state is not States.PROJECT_INACTIVE:
         return
 
     if request_method == 'GET' and 'duplicates' not in request_path:
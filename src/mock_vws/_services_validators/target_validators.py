@@ -29,12 +29,10 @@ def validate_target_id_exists(
     Raises:
         UnknownTarget: There are no matching targets for a given target ID.
     """
-    split_path = request_path.split('/')
-
-    if len(split_path) == 2:
+    if request_path.count('/') == 1:
         return
 
-    target_id = split_path[-1]
+    target_id = request_path.rpartition('/')[2]
     database = get_database_matching_server_keys(
         request_headers=request_headers,
         request_body=request_body,
@@ -45,11 +43,6 @@ def validate_target_id_exists(
 
     assert isinstance(database, VuforiaDatabase)
 
-    try:
-        [_] = [
-            target
-            for target in database.targets
-            if target.target_id == target_id and not target.delete_date
-        ]
-    except ValueError as exc:
-        raise UnknownTarget from exc
+    target = database.get_target(target_id=target_id)
+    if target is None or target.delete_date:
+        raise UnknownTarget
@@ -2,10 +2,10 @@
 Validators for the width field.
 """
 
-import json
 import numbers
 from http import HTTPStatus
 
+from mock_vws._mock_common import parse_json
 from mock_vws._services_validators.exceptions import Fail
 
 
@@ -23,11 +23,11 @@ def validate_width(request_body: bytes) -> None:
     if not request_body:
         return
 
-    request_text = request_body.decode()
-    if 'width' not in json.loads(request_text):
+    request_json = parse_json(request_body=request_body)
+    if 'width' not in request_json:
         return
 
-    width = json.loads(request_text).get('width')
+    width = request_json.get('width')
 
     width_is_number = isinstance(width, numbers.Number)
     width_positive = width_is_number and width > 0
@@ -4,7 +4,7 @@ Utilities for managing mock Vuforia databases.
 
 import uuid
 from dataclasses import dataclass, field
-from typing import Set
+from typing import Dict, Optional, Set
 
 from .states import States
 from .target import Target
@@ -32,3 +32,54 @@ class VuforiaDatabase:
     client_secret_key: str = field(default_factory=_random_hex, repr=False)
     targets: Set[Target] = field(default_factory=set, hash=False)
     state: States = States.WORKING
+    _targets_by_id: Dict[str, Target] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        """
+        Index the targets given to this database by ID.
+        """
+        self._targets_by_id.update(
+            (target.target_id, target) for target in self.targets
+        )
+
+    def add_target(self, target: Target) -> None:
+        """
+        Add a target to this database.
+
+        Args:
+            target: The target to add.
+        """
+        self.targets.add(target)
+        self._targets_by_id[target.target_id] = target
+
+    def get_target(self, target_id: str) -> Optional[Target]:
+        """
+        Args:
+            target_id: The ID of a target.
+
+        Returns:
+            The target in this database with the given ID, or ``None`` if there
+            is no such target.
+        """
+        target = self._targets_by_id.get(target_id)
+        if target is not None:
+            if target in self.targets:
+                return target
+            # The target was removed from ``targets`` directly.
+            del self._targets_by_id[target_id]
+
+        # Targets added to ``targets`` directly, rather than with
+        # ``add_target``, are not in the index until it is rebuilt.
+        if len(self._targets_by_id) == len(self.targets):
+            return None
+
+        self._targets_by_id.clear()
+        self._targets_by_id.update(
+            (target.target_id, target) for target in self.targets
+        )
+        return self._targets_by_id.get(target_id)
@@ -2,16 +2,19 @@
 A fake implementation of a target for the Vuforia Web Services API.
 """
 
+import base64
 import datetime
+import functools
+import hashlib
 import io
 import random
 import statistics
 import uuid
 from typing import Optional, Union
 
-from backports.zoneinfo import ZoneInfo
 from PIL import Image, ImageStat
 
+from mock_vws._base64_decoding import decode_base64
 from mock_vws._constants import TargetStatuses
 
 
@@ -28,9 +31,8 @@ class Target:  # pylint: disable=too-many-instance-attributes
     upload_date: datetime.datetime
     last_modified_date: datetime.datetime
     processed_tracking_rating: int
-    image: io.BytesIO
+    image_digest: bytes
     reco_rating: str
-    application_metadata: str
     delete_date: Optional[datetime.datetime]
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -66,10 +68,13 @@ class Target:  # pylint: disable=too-many-instance-attributes
             processed_tracking_rating (int): The tracking rating of the target
                 once it has been processed.
             image (io.BytesIO): The image data associated with the target.
+            image_digest (bytes): The SHA-256 digest of the image data.
             reco_rating (str): An empty string ("for now" according to
                 Vuforia's documentation).
             application_metadata (str): The base64 encoded application metadata
                 associated with the target.
+            query_application_metadata (typing.Optional[str]): The application
+                metadata as it is given in query results.
             delete_date (typing.Optional[datetime.datetime]): The time that the
                 target was deleted.
         """
@@ -77,8 +82,7 @@ class Target:  # pylint: disable=too-many-instance-attributes
         self.target_id = uuid.uuid4().hex
         self.active_flag = active_flag
         self.width = width
-        gmt = ZoneInfo('GMT')
-        now = datetime.datetime.now(tz=gmt)
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         self.upload_date: datetime.datetime = now
         self.last_modified_date = self.upload_date
         self.processed_tracking_rating = random.randint(0, 5)
@@ -88,6 +92,64 @@ class Target:  # pylint: disable=too-many-instance-attributes
         self.application_metadata = application_metadata
         self.delete_date: Optional[datetime.datetime] = None
 
+    @property
+    def image(self) -> io.BytesIO:
+        """
+        The image data associated with the target.
+
+        The image is stored as bytes, and a new file-like object is returned
+        each time.
+        Changing a returned file-like object does not change the image of the
+        target, or its digest; set this property to change the image.
+        """
+        return io.BytesIO(self._image_bytes)
+
+    @image.setter
+    def image(self, image: io.BytesIO) -> None:
+        """
+        Set the image data associated with the target, and its digest.
+        """
+        self._image_bytes = image.getvalue()
+        self.image_digest = hashlib.sha256(self._image_bytes).digest()
+
+    @property
+    def application_metadata(self) -> Optional[str]:
+        """
+        The base64 encoded application metadata associated with the target.
+        """
+        return self._application_metadata
+
+    @application_metadata.setter
+    def application_metadata(
+        self,
+        application_metadata: Optional[str],
+    ) -> None:
+        """
+        Set the application metadata.
+
+        The application metadata as it is given in query results is worked out
+        again when it is next needed.
+        """
+        self._application_metadata = application_metadata
+        self.__dict__.pop('query_application_metadata', None)
+
+    @functools.cached_property
+    def query_application_metadata(self) -> Optional[str]:
+        """
+        The application metadata as it is given in query results.
+
+        Vuforia accepts base64 which is not padded as usual, and gives the
+        canonical encoding in query results.
+        This is worked out when it is first needed, so that unusual metadata
+        is only decoded if the target is given in query results.
+        """
+        if self._application_metadata is None:
+            return None
+
+        return base64.b64encode(
+            decode_base64(encoded_data=self._application_metadata),
+        ).decode('ascii')
+
     def __repr__(self) -> str:
         """
         Return a representation which includes the target ID.
@@ -99,8 +161,7 @@ class Target:  # pylint: disable=too-many-instance-attributes
         """
         Mark the target as deleted.
         """
-        gmt = ZoneInfo('GMT')
-        now = datetime.datetime.now(tz=gmt)
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         self.delete_date = now
 
     @property
@@ -139,8 +200,7 @@ class Target:  # pylint: disable=too-many-instance-attributes
             seconds=self._processing_time_seconds,
         )
 
-        gmt = ZoneInfo('GMT')
-        now = datetime.datetime.now(tz=gmt)
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         time_since_change = now - self.last_modified_date
 
         if time_since_change <= processing_time:
@@ -167,8 +227,7 @@ class Target:  # pylint: disable=too-many-instance-attributes
             / 2,
         )
 
-        gmt = ZoneInfo('GMT')
-        now = datetime.datetime.now(tz=gmt)
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
         time_since_upload = now - self.upload_date
 
         if time_since_upload <= pre_rating_time:
@@ -0,0 +1,149 @@
+"""
+Tests for parsing ``multipart/form-data`` query request bodies.
+"""
+
+from typing import Dict
+
+import pytest
+
+from mock_vws._mock_common import parse_multipart
+
+_HEADERS: Dict[str, str] = {
+    'Content-Type': 'multipart/form-data; boundary=xyz',
+}
+
+
+class TestParseMultipart:
+    """
+    Tests for ``parse_multipart``, which gives the same results as
+    ``cgi.parse_multipart``.
+    """
+
+    @pytest.mark.parametrize('line_ending', [b'\r\n', b'\n'])
+    def test_fields_and_files(self, line_ending: bytes) -> None:
+        """
+        Files are given as bytes and other fields as strings, with the line
+        ending before the next delimiter removed.
+        """
+        request_body = line_ending.join(
+            [
+                b'--xyz',
+                b'Content-Disposition: form-data; name="max_num_results"',
+                b'',
+                b'2',
+                b'--xyz',
+                b'Content-Disposition: form-data; name="image"; '
+                b'filename="image.png"',
+                b'Content-Type: image/png',
+                b'',
+                b'\x89PNG\r\n\x1a\n',
+                b'--xyz--',
+                b'',
+            ],
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {
+            'max_num_results': ['2'],
+            'image': [b'\x89PNG\r\n\x1a\n'],
+        }
+
+    @pytest.mark.parametrize('trailing_data', [b'', b'\r\n'])
+    def test_no_closing_delimiter(self, trailing_data: bytes) -> None:
+        """
+        The last part ends at the end of the body if there is no closing
+        delimiter, and a final line ending is not part of its content.
+        """
+        request_body = (
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="image"; '
+            b'filename="image.png"\r\n'
+            b'\r\n'
+            b'image data' + trailing_data
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {'image': [b'image data']}
+
+    def test_delimiter_prefix_in_content(self) -> None:
+        """
+        A line in the content of a part which starts with the delimiter, but
+        which is not only the delimiter, is part of the content.
+        """
+        request_body = (
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="a"\r\n'
+            b'\r\n'
+            b'first\r\n'
+            b'--xyzXYZ\r\n'
+            b'--xyz--junk\r\n'
+            b'last\r\n'
+            b'--xyz--\r\n'
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {'a': ['first\r\n--xyzXYZ\r\n--xyz--junk\r\nlast']}
+
+    def test_delimiter_in_preamble(self) -> None:
+        """
+        The delimiter in the middle of a line before the first delimiter line
+        is ignored, as is the rest of the preamble.
+        """
+        request_body = (
+            b'preamble --xyz text\r\n'
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="a"\r\n'
+            b'\r\n'
+            b'value\r\n'
+            b'--xyz--\r\n'
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {'a': ['value']}
+
+    def test_no_name(self) -> None:
+        """
+        Parts with no ``Content-Disposition`` field name are given under
+        ``None``.
+        """
+        request_body = (
+            b'--xyz\r\n'
+            b'Content-Type: text/plain\r\n'
+            b'\r\n'
+            b'value\r\n'
+            b'--xyz--\r\n'
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {None: ['value']}
+
+    def test_repeated_field(self) -> None:
+        """
+        All values given for a field are given, in order.
+        """
+        request_body = (
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="a"\r\n'
+            b'\r\n'
+            b'1\r\n'
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="a"\r\n'
+            b'\r\n'
+            b'\r\n'
+            b'--xyz--\r\n'
+        )
+        parsed = parse_multipart(
+            request_headers=_HEADERS,
+            request_body=request_body,
+        )
+        assert parsed == {'a': ['1', '']}
@@ -182,6 +182,11 @@ class TestUpdate:
         )
 
         assert response.json().keys() == {'result_code', 'transaction_id'}
+        transaction_id = response.json()['transaction_id']
+        assert response.text == (
+            '{"result_code":"Success",'
+            f'"transaction_id":"{transaction_id}"}}'
+        )
 
         target_details = vws_client.get_target_record(target_id=target_id)
         # Targets go back to processing after being updated.
@@ -2,6 +2,7 @@
 Tests for the usage of the mock.
 """
 
+import binascii
 import email.utils
 import io
 import socket
@@ -20,6 +21,7 @@ from vws_auth_tools import rfc_1123_date
 from mock_vws import MockVWS
 from mock_vws.database import VuforiaDatabase
 from mock_vws.states import States
+from mock_vws.target import Target
 
 
 def request_unmocked_address() -> None:
@@ -533,6 +535,140 @@ class TestTargets:
         (target,) = database.targets
         assert repr(target) == f'<Target: {target_id}>'
 
+    def test_image(self, high_quality_image: io.BytesIO) -> None:
+        """
+        The image of a target is stored as bytes, so changing a file-like
+        object given by ``Target.image`` does not change the image.
+        """
+        target = Target(
+            name='example',
+            active_flag=True,
+            width=1,
+            image=high_quality_image,
+            processing_time_seconds=0,
+            application_metadata='',
+        )
+        image_data = high_quality_image.getvalue()
+        image_digest = target.image_digest
+
+        image = target.image
+        assert image.getvalue() == image_data
+        assert target.image is not image
+
+        image.write(b'other data')
+        assert target.image.getvalue() == image_data
+        assert target.image_digest == image_digest
+
+    def test_query_application_metadata(
+        self,
+        high_quality_image: io.BytesIO,
+    ) -> None:
+        """
+        The application metadata given in query results is worked out when it
+        is needed, and again after the application metadata is changed.
+        """
+        target = Target(
+            name='example',
+            active_flag=True,
+            width=1,
+            image=high_quality_image,
+            processing_time_seconds=0,
+            application_metadata='not base64!',
+        )
+
+        with pytest.raises(binascii.Error):
+            assert target.query_application_metadata
+
+        target.application_metadata = 'YQ'
+        assert target.query_application_metadata == 'YQ=='
+
+        target.application_metadata = 'not base64!'
+        target.application_metadata = None
+        assert target.query_application_metadata is None
+
+    def test_get_target(self, high_quality_image: io.BytesIO) -> None:
+        """
+        A target can be found in a database by its ID, even after the targets
+        of the database are changed directly.
+        """
+        database = VuforiaDatabase()
+
+        vws_client = VWS(
+            server_access_key=database.server_access_key,
+            server_secret_key=database.server_secret_key,
+        )
+
+        with MockVWS() as mock:
+            mock.add_database(database=database)
+            target_id = vws_client.add_target(
+                name='example',
+                width=1,
+                image=high_quality_image,
+                active_flag=True,
+                application_metadata=None,
+            )
+
+        (target,) = database.targets
+        assert database.get_target(target_id=target_id) is target
+        assert database.get_target(target_id='unknown') is None
+
+        database.targets.remove(target)
+        assert database.get_target(target_id=target_id) is None
+
+
+class TestGetTarget:
+    """
+    Tests for finding targets in a database by ID.
+    """
+
+    @staticmethod
+    def _target(image: io.BytesIO) -> Target:
+        """
+        Return a new target with the given image.
+        """
+        return Target(
+            name='example',
+            active_flag=True,
+            width=1,
+            image=image,
+            processing_time_seconds=0,
+            application_metadata='',
+        )
+
+    def test_missing_id(self, high_quality_image: io.BytesIO) -> None:
+        """
+        ``None`` is given for an ID which no target in the database has.
+        """
+        target = self._target(image=high_quality_image)
+        database = VuforiaDatabase(targets={target})
+
+        assert database.get_target(target_id='unknown') is None
+        assert database.get_target(target_id=target.target_id) is target
+        assert database.get_target(target_id='unknown') is None
+
+    def test_add_target(self, high_quality_image: io.BytesIO) -> None:
+        """
+        A target added with ``add_target`` is found.
+        """
+        target = self._target(image=high_quality_image)
+        database = VuforiaDatabase()
+        assert database.get_target(target_id=target.target_id) is None
+
+        database.add_target(target=target)
+        assert database.targets == {target}
+        assert database.get_target(target_id=target.target_id) is target
+
+    def test_added_directly(self, high_quality_image: io.BytesIO) -> None:
+        """
+        A target added directly to the targets of a database is found.
+        """
+        target = self._target(image=high_quality_image)
+        database = VuforiaDatabase()
+        assert database.get_target(target_id=target.target_id) is None
+
+        database.targets.add(target)
+        assert database.get_target(target_id=target.target_id) is target
+
 
 class TestDateHeader:
     """